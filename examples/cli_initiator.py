@@ -26,8 +26,8 @@ async def main(config_manager):
     try:
         logger.info(f"Starting initiator engine (Sender: {engine.sender}, Target: {engine.target}) to connect to {engine.host}:{engine.port}...")
         engine_task = asyncio.create_task(engine.start())
-        logger.info("Initiator engine.start() task created. Allowing time for connection attempt...")
-        await asyncio.sleep(2)
+        logger.info("Initiator engine.start() task created. Waiting for logon to complete...")
+        await engine.wait_until_active(timeout=2)
         await run_common_initiator_logic(engine, clordid_generator, logger, max_loops_disconnected=5)
         logger.info(f"Initiator example loop finished. Final engine state: {engine.state_machine.state.name if engine and hasattr(engine, 'state_machine') else 'UNKNOWN'}")
     except KeyboardInterrupt:
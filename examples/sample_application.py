@@ -181,5 +181,7 @@ async def run_common_initiator_logic(engine, clordid_generator, logger, max_loop
                 logger.info("Test orders sent. Initiating FIX Logoff handshake via engine.request_logoff().")
                 await engine.request_logoff(timeout=10)
                 break
-
-        await asyncio.sleep(1)
\ No newline at end of file
+            await asyncio.sleep(1)
+        else:
+            # Wake as soon as the logon completes instead of on the next one-second poll
+            await engine.wait_until_active(timeout=1)
\ No newline at end of file
@@ -249,10 +249,8 @@ def len_and_chsum(msg, group=False):
         fragment_len, fragment_ordered_parts = \
             _calculate_length_and_get_ordered_byte_parts(msg, codec_spec_obj, type_spec_obj_for_current_level) # type_spec_obj_for_current_level might be None
         
-        raw_chsum_for_fragment = 0
-        for part_bytes in fragment_ordered_parts:
-            raw_chsum_for_fragment += STRSUM(part_bytes)
-        return fragment_len, raw_chsum_for_fragment
+        # One C-level sum over the joined fields rather than a Python-level add per field
+        return fragment_len, STRSUM(b''.join(fragment_ordered_parts))
 
     # --- Processing for a top-level message (group=False) ---
     tag_8_val = msg.get(8) # Prefer int key
@@ -26,6 +26,27 @@ MILLISECONDS = 1
 HEADER_TAGS_SET = {str(tag) for tag in HEADER_TAGS}
 ENCODED_TAG_SET = {str(tag) for tag in ENCODED_DATA_TAGS}
 
+# Compiled tokenisers keyed by (delimiter, separator, bytes input), so parse() does not
+# rebuild and re-escape the pattern for every message
+_TOKENISER_CACHE = {}
+
+
+# Encoded "<tag><delimiter>" prefixes for serialise(); the set of tags in use is small and fixed
+_TAG_PREFIXES = {}
+
+
+def _tokeniser(delimiter, separator, binary):
+    key = (delimiter, separator, binary)
+    regex = _TOKENISER_CACHE.get(key)
+    if regex is None:
+        pattern = FIX_REGEX_STRING.format(d=re.escape(delimiter), s=re.escape(separator))
+        if binary:
+            regex = re.compile(six.ensure_binary(pattern, encoding='ascii'), re.DOTALL)
+        else:
+            regex = re.compile(six.ensure_text(pattern, encoding='ascii'), re.DOTALL)
+        _TOKENISER_CACHE[key] = regex
+    return regex
+
 
 class Codec(object):
     """
@@ -108,16 +129,14 @@ class Codec(object):
 
         if isinstance(buff, six.text_type):
             input_in_unicode = True
-            custom_r = re.compile(six.ensure_text(FIX_REGEX_STRING.format(
-                d=re.escape(delimiter), s=re.escape(separator)), encoding='ascii'), re.DOTALL)
+            custom_r = _tokeniser(delimiter, separator, False)
             if self.encoding is not None:
                 encoding = None  # No need to decode
                 warnings.warn('Processing a unicode message and ignore the argument "decode_as={}"'.format(self.encoding))
             if self.decode_all_as_347:
                 warnings.warn('Processing a unicode message and ignore the argument "decode_all_as_347={}"'.format(self.decode_all_as_347))
         elif isinstance(buff, bytes):
-            custom_r = re.compile(six.ensure_binary(FIX_REGEX_STRING.format(
-                d=re.escape(delimiter), s=re.escape(separator)), encoding='ascii'), re.DOTALL)
+            custom_r = _tokeniser(delimiter, separator, True)
         else:
             raise ValueError('Unsupported type of input: {}'.format(type(buff)))
 
@@ -281,16 +300,20 @@ class Codec(object):
         """
         tag_vals = self._unmap(msg)
         output = deque()
+        separator_bytes = separator.encode('ascii')
         for tag, value in tag_vals:
-            if isinstance(tag, int):
-                output.append(str(tag).encode('ascii'))
-            elif isinstance(tag, bytes):
-                output.append(tag)
-            elif isinstance(tag, six.text_type):
-                output.append(tag.encode('ascii'))
-            else:
-                output.append(str(tag).encode('ascii'))
-            output.append(delimiter.encode('ascii'))
+            prefix = _TAG_PREFIXES.get((tag, delimiter))
+            if prefix is None:
+                if isinstance(tag, bytes):
+                    prefix = tag
+                elif isinstance(tag, six.text_type):
+                    prefix = tag.encode('ascii')
+                else:
+                    prefix = str(tag).encode('ascii')
+                prefix += delimiter.encode('ascii')
+                if len(_TAG_PREFIXES) < 4096:
+                    _TAG_PREFIXES[(tag, delimiter)] = prefix
+            output.append(prefix)
             if isinstance(value, int):
                 output.append(str(value).encode('UTF-8'))
             elif isinstance(value, bytes):
@@ -304,5 +327,5 @@ class Codec(object):
                     output.append(value.encode(self.encoding))
                 else:
                     output.append(value.encode('UTF-8'))
-            output.append(separator.encode('ascii'))
+            output.append(separator_bytes)
         return b''.join(output)
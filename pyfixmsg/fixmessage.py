@@ -335,11 +335,24 @@ class FixMessage(FixFragment):  # pylint: disable=R0904
 
     def to_wire(self, codec=None):
         """
-        Return wire representation according to a codec
+        Return wire representation according to a codec.
+        BodyLength and CheckSum are derived from the serialised bytes, so the fields are only encoded once.
         """
         codec = codec or self.codec
-        self.set_len_and_chksum()
-        return codec.serialise(self)
+        self.pop(9, None)
+        self.pop(10, None)
+        wire = codec.serialise(self)
+        if not wire.startswith(b'8='):
+            # No BeginString to anchor the length on; fall back to computing from the fields
+            self.set_len_and_chksum()
+            return codec.serialise(self)
+        head_end = wire.index(b'\x01') + 1
+        body_length = len(wire) - head_end
+        length_field = b'9=%d\x01' % body_length
+        raw_checksum = (sum(wire) + sum(length_field)) % 256
+        self[9] = str(body_length)
+        self[10] = self.checksum(raw_checksum)
+        return b''.join((wire[:head_end], length_field, wire[head_end:], b'10=%03d\x01' % raw_checksum))
 
     def from_wire(self, msg, codec=None):
         """
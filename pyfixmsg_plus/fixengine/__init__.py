@@ -1,5 +1,5 @@
 from .engine import FixEngine
-from .configmanager import ConfigManager
+from .configmanager import ConfigManager, get_config_manager
 from .heartbeat import Heartbeat
 from .heartbeat_builder import HeartbeatBuilder
 from .testrequest import TestRequest
@@ -30,6 +30,7 @@ from .simple_crypt import SimpleCrypt
 __all__ = [
     "FixEngine",
     "ConfigManager",
+    "get_config_manager",
     "Heartbeat",
     "HeartbeatBuilder",
     "TestRequest",
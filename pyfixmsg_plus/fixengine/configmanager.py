@@ -1,62 +1,268 @@
+import base64
 import configparser
-from pyfixmsg_plus.fixengine.simple_crypt import SimpleCrypt
+import functools
+import hashlib
+import logging
+import os
+try:
+    import tomllib
+except ImportError:  # Python < 3.11: .toml configs are not supported
+    tomllib = None
+try:
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+except ImportError:  # optional: pycryptodome is tried next, then SimpleCrypt
+    AESGCM = None
+try:
+    from Crypto.Cipher import AES as _PyCryptodomeAES
+except ImportError:
+    _PyCryptodomeAES = None
+from pyfixmsg_plus.fixengine.simple_crypt import SimpleCrypt, SimpleCryptException
+
+logger = logging.getLogger(__name__)
+
+# Parsed config files keyed by resolved path: (mtime_ns, size, content digest, {section: {option: value}}).
+# Lets repeated loads of an unchanged file skip the read and the configparser tokenisation.
+_CONFIG_CACHE = {}
 
 # Provide module-level encrypt/decrypt helpers using a default salt
 _DEFAULT_CRYPT_SALT = "seasalt_is_salty"
 _simple_crypt = SimpleCrypt(_DEFAULT_CRYPT_SALT)
 
-def encrypt(value):
+# Opt-in (aead=True): values sealed with AES-GCM (AES-NI where available) via cryptography or
+# pycryptodome are tagged with this prefix. They only decrypt where one of those packages is
+# installed, so SimpleCrypt stays the default and untagged values are SimpleCrypt.
+_AESGCM_PREFIX = "gcm:"
+_AESGCM_KEY = hashlib.pbkdf2_hmac('sha256', _DEFAULT_CRYPT_SALT.encode('utf-8'),
+                                  _DEFAULT_CRYPT_SALT.encode('utf-8'), 1, 32)
+
+class _PyCryptodomeAESGCM:
+    """pycryptodome behind the AESGCM encrypt/decrypt interface; output is ciphertext + 16-byte tag as well."""
+
+    def __init__(self, key):
+        self._key = key
+
+    def encrypt(self, nonce, data, associated_data):
+        ciphertext, tag = _PyCryptodomeAES.new(self._key, _PyCryptodomeAES.MODE_GCM, nonce=nonce).encrypt_and_digest(data)
+        return ciphertext + tag
+
+    def decrypt(self, nonce, data, associated_data):
+        cipher = _PyCryptodomeAES.new(self._key, _PyCryptodomeAES.MODE_GCM, nonce=nonce)
+        return cipher.decrypt_and_verify(data[:-16], data[-16:])
+
+# One AEAD context for the process: the key schedule is set up here, calls only supply a nonce
+if AESGCM is not None:
+    _aesgcm = AESGCM(_AESGCM_KEY)
+elif _PyCryptodomeAES is not None:
+    _aesgcm = _PyCryptodomeAESGCM(_AESGCM_KEY)
+else:
+    _aesgcm = None
+
+def encrypt(value, aead=False):
+    if aead:
+        if _aesgcm is None:
+            raise SimpleCryptException("AES-GCM encryption requires the 'cryptography' or 'pycryptodome' package")
+        nonce = os.urandom(12)
+        sealed = _aesgcm.encrypt(nonce, value.encode('utf-8'), None)
+        return _AESGCM_PREFIX + base64.b64encode(nonce + sealed).decode('ascii')
     return _simple_crypt.encrypt(_DEFAULT_CRYPT_SALT.encode('utf-8'), value)
 
+# Each SimpleCrypt decrypt runs a 100k-iteration PBKDF2; the same ENC: values are read on every
+# engine start/reconfigure, so remember the plaintext per ciphertext.
+@functools.lru_cache(maxsize=64)
 def decrypt(value):
+    if value.startswith(_AESGCM_PREFIX):
+        if _aesgcm is None:
+            raise SimpleCryptException("AES-GCM encrypted value requires the 'cryptography' or 'pycryptodome' package")
+        data = base64.b64decode(value[len(_AESGCM_PREFIX):])
+        return _aesgcm.decrypt(data[:12], data[12:], None).decode('utf-8')
     return _simple_crypt.decrypt(_DEFAULT_CRYPT_SALT.encode('utf-8'), value)
 
+# Spellings accepted for boolean options; the common exact forms hit the set without allocating.
+_TRUE_VALUES = frozenset({'true', 'True', 'TRUE', 'yes', 'Yes', 'YES', 'y', 'Y', '1', 'on', 'On', 'ON'})
+
+def config_flag(value):
+    """Interpret a config string such as 'true', 'Y' or '1' as a boolean."""
+    if value in _TRUE_VALUES:
+        return True
+    return isinstance(value, str) and value.strip().lower() in _TRUE_VALUES
+
+def _toml_sections(raw):
+    """Map a TOML document onto configparser-style sections; top-level keys become DEFAULT."""
+    def as_option(value):
+        return ('true' if value else 'false') if isinstance(value, bool) else str(value)
+
+    sections = {}
+    for name, value in tomllib.loads(raw.decode('utf-8')).items():
+        if isinstance(value, dict):
+            sections[name] = {option: as_option(v) for option, v in value.items()}
+        else:
+            sections.setdefault('DEFAULT', {})[name] = as_option(value)
+    return sections
+
+def _read_config_file(config_path):
+    """Return the parsed sections of config_path, reusing the cached parse while the file is unchanged."""
+    path = os.path.realpath(config_path)  # symlinked copies of one file share a cache entry
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return {}  # configparser.read() silently skips unreadable files; keep that behaviour
+    cached = _CONFIG_CACHE.get(path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[3]
+    with open(path, 'rb') as f:
+        raw = f.read()
+    digest = hashlib.blake2b(raw, digest_size=8).digest()
+    if cached and cached[2] == digest:
+        # Touched but not modified
+        sections = cached[3]
+    elif tomllib is not None and path.endswith('.toml'):
+        # tomllib parses in C; no configparser line tokenisation at all
+        sections = _toml_sections(raw)
+    else:
+        parser = configparser.ConfigParser()
+        parser.read_string(raw.decode('utf-8'), source=config_path)
+        defaults = parser.defaults()
+        sections = {'DEFAULT': dict(defaults)} if defaults else {}
+        for section in parser.sections():
+            sections[section] = {
+                option: value for option, value in parser.items(section, raw=True)
+                if defaults.get(option) != value
+            }
+    _CONFIG_CACHE[path] = (stat.st_mtime_ns, stat.st_size, digest, sections)
+    return sections
+
+class _CachedConfigParser(configparser.ConfigParser):
+    """ConfigParser that empties ConfigManager's lookup cache whenever its contents change."""
+
+    def __init__(self, *args, **kwargs):
+        self.lookup_cache = {}
+        super().__init__(*args, **kwargs)
+
+    # read_string/read_dict and item assignment all funnel through these
+    def read(self, *args, **kwargs):
+        self.lookup_cache.clear()
+        return super().read(*args, **kwargs)
+
+    def read_file(self, *args, **kwargs):
+        self.lookup_cache.clear()
+        return super().read_file(*args, **kwargs)
+
+    def add_section(self, section):
+        self.lookup_cache.clear()
+        super().add_section(section)
+
+    def set(self, section, option, value=None):
+        self.lookup_cache.clear()
+        super().set(section, option, value)
+
+    def remove_option(self, section, option):
+        self.lookup_cache.clear()
+        return super().remove_option(section, option)
+
+    def remove_section(self, section):
+        self.lookup_cache.clear()
+        return super().remove_section(section)
+
 # Ensure there's only one instance of ConfigManager (Singleton).
 class ConfigManager:
     _instance = None
+    initialized = False  # class default, so the re-init guard is a plain attribute read
 
     def __new__(cls, *args, **kwargs):
         if not cls._instance:
             cls._instance = super().__new__(cls)
         return cls._instance
 
+    @classmethod
+    def instance(cls):
+        """Return the shared ConfigManager (created with the default path on first use) without re-entering __init__."""
+        return cls._instance or cls()
+
     def __init__(self, config_path='config.ini'):
-        if not hasattr(self, 'initialized'):
-            self.config = configparser.ConfigParser()
+        if not self.initialized:
+            self.config = _CachedConfigParser()
             self.config_path = config_path
             self.load_config()
             self.initialized = True
 
     def load_config(self):
         try:
-            self.config.read(self.config_path)
+            self.config.read_dict(_read_config_file(self.config_path))
         except FileNotFoundError:
-            print(f"Warning: Configuration file '{self.config_path}' not found. Using default settings.")
+            logger.warning("Configuration file '%s' not found. Using default settings.", self.config_path)
 
     def save_config(self):
+        if self.config_path.endswith('.toml'):
+            logger.error("Error saving configuration: '%s' is TOML, which is loaded read-only.", self.config_path)
+            return
         try:
             with open(self.config_path, 'w') as configfile:
                 self.config.write(configfile)
         except Exception as e:
-            print(f"Error saving configuration: {e}")
+            logger.error("Error saving configuration: %s", e)
 
     def get(self, section, option, fallback=None, decrypt_value=False):
-        try:
-            value = self.config.get(section, option, fallback=fallback)
-            if decrypt_value and value and value.startswith("ENC:"):
+        # (value, present) per option, so callers passing different fallbacks share one entry
+        cache = self.config.lookup_cache
+        entry = cache.get((section, option))
+        if entry is None:
+            snapshot = self._section_snapshot(section)
+            key = self.config.optionxform(option)
+            if snapshot is not None and key in snapshot:
+                entry = (snapshot[key], True)
+            # has_option() up front rather than building and catching NoSectionError/NoOptionError
+            elif snapshot is None and self.config.has_option(section, option):
+                entry = (self.config.get(section, option), True)
+            else:
+                logger.debug("Section '%s' or option '%s' not found. Returning fallback value.", section, option)
+                entry = (None, False)
+            cache[(section, option)] = entry
+        value = entry[0] if entry[1] else fallback
+        if decrypt_value and value and value.startswith("ENC:"):
+            if not entry[1]:
                 return decrypt(value[4:])
-            return value
-        except (configparser.NoSectionError, configparser.NoOptionError):
-            print(f"Warning: Section '{section}' or option '{option}' not found. Returning fallback value.")
-            return fallback
+            # Plaintext of a stored option is cached beside it, so it outlives decrypt()'s shared LRU
+            plain = cache.get((section, option, True))
+            if plain is None:
+                plain = cache[(section, option, True)] = decrypt(value[4:])
+            return plain
+        return value
+
+    def _section_snapshot(self, section):
+        """
+        Plain dict of a section's interpolated options (DEFAULT included), built in one configparser pass
+        on first use and cached until the parser changes. None if a value cannot be interpolated, in which
+        case lookups fall back to configparser one option at a time.
+        """
+        cache = self.config.lookup_cache
+        snapshot = cache.get(section, False)  # sections are keyed by name, options by (section, option)
+        if snapshot is False:
+            try:
+                if self.config.has_section(section):
+                    snapshot = dict(self.config.items(section))
+                elif section == self.config.default_section:
+                    snapshot = dict(self.config.defaults())
+                else:
+                    snapshot = {}  # like has_option(): DEFAULT values do not leak into missing sections
+            except configparser.InterpolationError:
+                snapshot = None
+            cache[section] = snapshot
+        return snapshot
+
+    def get_section(self, section):
+        """Return all options of a section (including DEFAULT) as a plain dict, or {} if it is missing."""
+        snapshot = self._section_snapshot(section)
+        if snapshot is None:
+            return dict(self.config.items(section))  # raises the InterpolationError to the caller
+        return dict(snapshot)
 
     def get_message_store_type(self, fallback='database'):
         """Gets the message store type from the config, e.g., 'database' or 'aiosqlite'."""
         return self.get('FIX', 'message_store_type', fallback=fallback)
 
-    def set(self, section, option, value, encrypt_value=False):
+    def set(self, section, option, value, encrypt_value=False, aead=False):
         if encrypt_value:
-            value = "ENC:" + encrypt(value)
+            value = "ENC:" + encrypt(value, aead=aead)
         if not self.config.has_section(section):
             self.config.add_section(section)
         self.config.set(section, option, value)
@@ -66,21 +272,31 @@ class ConfigManager:
             if self.config.has_section(section) and self.config.has_option(section, option):
                 self.config.remove_option(section, option)
             else:
-                print(f"Warning: Section '{section}' or option '{option}' not found.")
+                logger.warning("Section '%s' or option '%s' not found.", section, option)
         else:
             if self.config.has_section(section):
                 self.config.remove_section(section)
             else:
-                print(f"Warning: Section '{section}' not found.")
+                logger.warning("Section '%s' not found.", section)
 
     def reset(self):
-        self.config = configparser.ConfigParser()
+        self.config = _CachedConfigParser()
         self.save_config()
 
+@functools.lru_cache(maxsize=None)
+def get_config_manager(config_path='config.ini'):
+    """
+    Return the ConfigManager for config_path, creating and loading it on first use.
+    Unlike ConfigManager(), which always hands back the one shared instance, each path gets its own manager.
+    """
+    manager = object.__new__(ConfigManager)
+    manager.__init__(config_path)
+    return manager
+
 # Example usage
 if __name__ == "__main__":
     cm1 = ConfigManager()
-    cm2 = ConfigManager()
+    cm2 = ConfigManager.instance()
     cm1.load_config()
 
     # Set and get a plain value
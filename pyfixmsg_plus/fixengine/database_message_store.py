@@ -1,35 +1,283 @@
 import sqlite3
-from datetime import datetime, UTC
+import time
 import logging
 import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
+
+# Applied to every store connection: WAL appends instead of rollback-journal rewrites and
+# synchronous=NORMAL syncs at checkpoints rather than twice per commit
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    # Checkpoint every ~8 MB of WAL rather than ~4 MB, and cap the file that is left behind afterwards
+    "PRAGMA wal_autocheckpoint=2000",
+    "PRAGMA journal_size_limit=67108864",
+)
+
+# Statement text is fixed per operation, so each compiles once into the connection's statement
+# cache (keyed by SQL text) and every later call is a cache hit
+SQL_STORE_MESSAGE = '''
+    INSERT OR REPLACE INTO messages (beginstring, sendercompid, targetcompid, msgseqnum, message)
+    VALUES (?, ?, ?, ?, ?)
+'''
+# Bulk stores insert up to BULK_INSERT_ROWS rows per statement: one parse/plan and one step per chunk
+# instead of per row. 199 rows x 5 columns stays under the 999-parameter limit of older SQLite builds.
+BULK_INSERT_ROWS = 199
+SQL_STORE_MESSAGES_PREFIX = 'INSERT OR REPLACE INTO messages (beginstring, sendercompid, targetcompid, msgseqnum, message) VALUES '
+SQL_STORE_MESSAGES_BULK = SQL_STORE_MESSAGES_PREFIX + ','.join(['(?, ?, ?, ?, ?)'] * BULK_INSERT_ROWS)
+SQL_GET_MESSAGE = '''
+    SELECT message FROM messages WHERE beginstring = ? AND sendercompid = ? AND targetcompid = ? AND msgseqnum = ?
+'''
+# Both lookups are SEARCHes on the primary key index; the range walks it in msgseqnum order, so the
+# ORDER BY costs no sort step
+SQL_GET_MESSAGE_RANGE = '''
+    SELECT msgseqnum, message FROM messages WHERE beginstring = ? AND sendercompid = ? AND targetcompid = ?
+    AND msgseqnum BETWEEN ? AND ? ORDER BY msgseqnum
+'''
+SQL_LOAD_SEQUENCE_NUMBERS = '''
+    SELECT next_incoming_seqnum, next_outgoing_seqnum, rowid FROM sessions WHERE
+    beginstring = ? AND sendercompid = ? AND targetcompid = ?
+'''
+SQL_SESSION_ROWID = '''
+    SELECT rowid FROM sessions WHERE beginstring = ? AND sendercompid = ? AND targetcompid = ?
+'''
+# Once the session row exists it is addressed by rowid: no conflict resolution, no CASE
+SQL_UPDATE_SEQUENCE_NUMBERS = '''
+    UPDATE sessions SET next_incoming_seqnum = ?, next_outgoing_seqnum = ? WHERE rowid = ?
+'''
+SQL_RESET_SESSION = '''
+    UPDATE sessions SET next_incoming_seqnum = 1, next_outgoing_seqnum = 1, creation_time = ? WHERE rowid = ?
+'''
+SQL_SAVE_SEQUENCE_NUMBERS = '''
+    INSERT INTO sessions (beginstring, sendercompid, targetcompid, creation_time, next_incoming_seqnum, next_outgoing_seqnum)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(beginstring, sendercompid, targetcompid)
+    DO UPDATE SET next_incoming_seqnum = excluded.next_incoming_seqnum, 
+                  next_outgoing_seqnum = excluded.next_outgoing_seqnum,
+                  creation_time = CASE WHEN excluded.next_incoming_seqnum = 1 AND excluded.next_outgoing_seqnum = 1 
+                                       THEN excluded.creation_time 
+                                       ELSE creation_time END
+'''
+
+# Connections shared by every store on the same database file (e.g. several sessions with one
+# state_file), so they share one page cache and statement cache. The asyncio lock in each entry only
+# serves one event loop, so stores on other loops get their own entry: (realpath, loop) -> _SharedConnection
+_SHARED_CONNECTIONS = {}
+
+
+def epoch_micros():
+    """Row timestamps are integer microseconds since the epoch; nothing is formatted on the write path."""
+    return time.time_ns() // 1000
+
+
+def _open_connection(db_path):
+    # Statements run on the connection's executor thread, not the thread that opened it
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.row_factory = None  # plain tuples; the store indexes rows positionally
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def _open_executor():
+    # One worker per connection: every statement on it is serialized without blocking the event loop
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix='fix-msgstore')
+
+
+class _SharedConnection:
+    """A writer connection plus the state of its single implicit transaction.
+
+    Every store on the file writes into the same open transaction, so the lock that serializes
+    writes, the count of uncommitted rows and the commit decision belong here, not to one store.
+    """
+
+    __slots__ = ('key', 'conn', 'executor', 'lock', 'uncommitted', 'users')
+
+    def __init__(self, db_path, key=None):
+        self.key = key
+        self.conn = _open_connection(db_path)
+        self.executor = _open_executor()  # the only thread that should touch conn
+        self.lock = asyncio.Lock()
+        self.uncommitted = 0
+        self.users = 0
+
+
+def _acquire_connection(db_path):
+    if db_path == ':memory:':  # every in-memory connection is its own database; never share
+        entry = _SharedConnection(db_path)
+    else:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None  # built outside a loop; the lock binds to whichever loop first awaits it
+        key = (os.path.realpath(db_path), loop)
+        entry = _SHARED_CONNECTIONS.get(key)
+        if entry is None:
+            entry = _SHARED_CONNECTIONS[key] = _SharedConnection(db_path, key)
+    entry.users += 1
+    return entry
+
+
+def _release_connection(entry):
+    entry.users -= 1
+    if entry.users:
+        return
+    if entry.key is not None and _SHARED_CONNECTIONS.get(entry.key) is entry:
+        del _SHARED_CONNECTIONS[entry.key]
+    entry.executor.shutdown(wait=True)
+    entry.conn.close()
+
+
+def _open_reader(db_path):
+    # WAL lets read-only connections run beside the writer; they never take the write lock
+    return sqlite3.connect(f"file:{os.path.abspath(db_path)}?mode=ro", uri=True, check_same_thread=False)
+
+
+def _upsert_session(conn, params):
+    """Write the session row the first time and return its rowid for later UPDATEs."""
+    conn.execute(SQL_SAVE_SEQUENCE_NUMBERS, params)
+    return conn.execute(SQL_SESSION_ROWID, params[:3]).fetchone()[0]
+
+
+def _insert_rows(conn, rows):
+    """Insert rows in multi-VALUES chunks; returns the number of rows written.
+
+    The chunks run inside a savepoint of the open transaction, so a bad row undoes this batch only
+    and leaves rows other callers have pending on the connection untouched.
+    """
+    if not conn.in_transaction:
+        conn.execute("BEGIN")
+    conn.execute("SAVEPOINT store_messages")
+    rows = iter(rows)
+    count = 0
+    try:
+        while True:
+            chunk = list(islice(rows, BULK_INSERT_ROWS))
+            if not chunk:
+                break
+            if len(chunk) == BULK_INSERT_ROWS:
+                sql = SQL_STORE_MESSAGES_BULK
+            else:
+                sql = SQL_STORE_MESSAGES_PREFIX + ','.join(['(?, ?, ?, ?, ?)'] * len(chunk))
+            conn.execute(sql, list(chain.from_iterable(chunk)))
+            count += len(chunk)
+    except BaseException:
+        conn.execute("ROLLBACK TO store_messages")
+        conn.execute("RELEASE store_messages")
+        raise
+    conn.execute("RELEASE store_messages")
+    return count
+
+
+def _checkpoint(conn, mode):
+    # A connection cannot checkpoint inside its own open write transaction; the next attempt will
+    if conn.in_transaction:
+        return None
+    return conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+
+
+def _fetchone(conn, sql, params):
+    return conn.execute(sql, params).fetchone()
+
+
+def _fetchall(conn, sql, params):
+    return conn.execute(sql, params).fetchall()
 
 class DatabaseMessageStore:
-    def __init__(self, db_path, beginstring=None, sendercompid=None, targetcompid=None):
+    def __init__(self, db_path, beginstring=None, sendercompid=None, targetcompid=None, seqnum_flush_interval=0.25,
+                 commit_batch_size=256, reader_pool_size=2, checkpoint_interval=30.0):
         self.db_path = db_path
         # Ensure parent directory exists
         db_dir = os.path.dirname(db_path)
         if db_dir and not os.path.exists(db_dir):
             os.makedirs(db_dir, exist_ok=True)
-        self.conn = sqlite3.connect(db_path)
+        self._shared = _acquire_connection(db_path)
+        self.conn = self._shared.conn
+        self._db_executor = self._shared.executor
+        self._lock = self._shared.lock
         self.logger = logging.getLogger(self.__class__.__name__)
-        self.create_table()
-        self._lock = asyncio.Lock()
+        self._db_executor.submit(self.create_table).result()
         self.beginstring = beginstring
         self.sendercompid = sendercompid
         self.targetcompid = targetcompid
+        # Fixed for the store's lifetime: packed once and prefixed onto every session-keyed bind tuple
+        self._session_key = (beginstring, sendercompid, targetcompid)
         self.incoming_seqnum = 1
         self.outgoing_seqnum = 1
+        self._session_rowid = None
+        # Per-message increments are written back at most once per interval instead of on every message;
+        # explicit set/reset calls and close() still persist immediately.
+        self.seqnum_flush_interval = seqnum_flush_interval
+        self._seqnum_dirty = False
+        self._flush_task = None
+        # Stored messages ride in the same transaction as the next sequence-number write, so a
+        # message and its increment cost one commit; commit_batch_size bounds the open batch, which
+        # is shared with every other store on the same connection (see _uncommitted)
+        self.commit_batch_size = commit_batch_size
+        # WAL pages are copied back by a PASSIVE checkpoint from a timer, so a writer is rarely the one
+        # drafted into the auto-checkpoint mid-message
+        self.checkpoint_interval = checkpoint_interval
+        self._checkpoint_task = None
+        # Message lookups (ResendRequest replay) go to read-only connections so they never queue behind
+        # writes on self._lock; an in-memory database has no file to share and reads through the writer
+        self._read_pool = None
+        self._read_executor = None
+        if reader_pool_size and db_path != ':memory:':
+            self._read_pool = asyncio.Queue()
+            for _ in range(reader_pool_size):
+                self._read_pool.put_nowait(_open_reader(db_path))
+            self._read_executor = ThreadPoolExecutor(max_workers=reader_pool_size, thread_name_prefix='fix-msgstore-read')
+        self._initialized = False
+        self._closed = False
 
     async def initialize(self):
+        # MessageStoreFactory already initializes; a second call (e.g. FixEngine.initialize()) must not
+        # reload the counters over increments that have not been flushed yet
+        if self._initialized:
+            return
+        self._initialized = True
+        if self.checkpoint_interval and self.db_path != ':memory:':
+            self._checkpoint_task = asyncio.ensure_future(self._checkpoint_loop())
         if self.beginstring and self.sendercompid and self.targetcompid:
             loaded_in, loaded_out = await self.load_sequence_numbers()
             self.incoming_seqnum = loaded_in
             self.outgoing_seqnum = loaded_out
-            self.logger.info(f"Loaded sequence numbers for session {self.beginstring}-{self.sendercompid}-{self.targetcompid}: NextIncoming={self.incoming_seqnum}, NextOutgoing={self.outgoing_seqnum}")
+            self.logger.info("Loaded sequence numbers for session %s-%s-%s: NextIncoming=%s, NextOutgoing=%s", self.beginstring, self.sendercompid, self.targetcompid, self.incoming_seqnum, self.outgoing_seqnum)
         else:
             self.logger.info("Session identifiers not set at init. Defaulting sequence numbers to 1 (as next expected).")
 
+    @property
+    def _uncommitted(self):
+        # Rows pending in the connection's transaction, whichever store on it wrote them
+        return self._shared.uncommitted
+
+    @_uncommitted.setter
+    def _uncommitted(self, value):
+        self._shared.uncommitted = value
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._db_executor, fn, *args)
+
+    async def _read(self, fn, sql, params):
+        if self._read_pool is None:
+            async with self._lock:
+                return await self._run(fn, self.conn, sql, params)
+        if self._uncommitted:
+            # Readers only see committed rows; publish the open batch before looking anything up
+            async with self._lock:
+                if self._uncommitted:
+                    await self._commit()
+        conn = await self._read_pool.get()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._read_executor, fn, conn, sql, params)
+        finally:
+            self._read_pool.put_nowait(conn)
+
     def create_table(self):
         cursor = self.conn.cursor()
         cursor.execute('''
@@ -38,7 +286,7 @@ class DatabaseMessageStore:
                 sendercompid TEXT NOT NULL, 
                 targetcompid TEXT NOT NULL, 
                 msgseqnum INTEGER NOT NULL,
-                message TEXT NOT NULL,
+                message BLOB NOT NULL,
                 timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
                 PRIMARY KEY (beginstring, sendercompid, targetcompid, msgseqnum) 
             )
@@ -48,7 +296,7 @@ class DatabaseMessageStore:
                 beginstring TEXT NOT NULL,
                 sendercompid TEXT NOT NULL,
                 targetcompid TEXT NOT NULL,
-                creation_time TEXT NOT NULL,
+                creation_time INTEGER NOT NULL,
                 next_incoming_seqnum INTEGER NOT NULL, 
                 next_outgoing_seqnum INTEGER NOT NULL, 
                 PRIMARY KEY (beginstring, sendercompid, targetcompid)
@@ -57,50 +305,97 @@ class DatabaseMessageStore:
         self.conn.commit()
 
     async def store_message(self, beginstring, sendercompid, targetcompid, msgseqnum, message):
+        if self._closed:
+            self.logger.warning("Attempted to store message after DB was closed.")
+            return
         async with self._lock:
             try:
-                cursor = self.conn.cursor()
-                cursor.execute('''
-                    INSERT OR REPLACE INTO messages (beginstring, sendercompid, targetcompid, msgseqnum, message)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (beginstring, sendercompid, targetcompid, msgseqnum, message))
-                self.conn.commit()
-                self.logger.debug(f"Stored message: {sendercompid}->{targetcompid} Seq={msgseqnum}")
+                await self._run(self.conn.execute, SQL_STORE_MESSAGE, (beginstring, sendercompid, targetcompid, msgseqnum, message))
+                self._uncommitted += 1
+                if self._uncommitted >= self.commit_batch_size:
+                    await self._commit()
+                else:
+                    self._schedule_flush()
+                self.logger.debug("Stored message: %s->%s Seq=%s", sendercompid, targetcompid, msgseqnum)
             except Exception as e:
-                self.logger.error(f"Error storing message for Seq={msgseqnum}: {e}", exc_info=True)
+                self.logger.error("Error storing message for Seq=%s: %s", msgseqnum, e, exc_info=True)
 
-    async def get_message(self, beginstring, sendercompid, targetcompid, msgseqnum):
+    async def store_messages(self, rows):
+        """Store many (beginstring, sendercompid, targetcompid, msgseqnum, message) rows with multi-row INSERTs and one commit."""
+        if self._closed:
+            self.logger.warning("Attempted to store message after DB was closed.")
+            return
         async with self._lock:
             try:
-                cursor = self.conn.cursor()
-                cursor.execute('''
-                    SELECT message FROM messages WHERE beginstring = ? AND sendercompid = ? AND targetcompid = ? AND msgseqnum = ?
-                ''', (beginstring, sendercompid, targetcompid, msgseqnum))
-                result = cursor.fetchone()
-                if result:
-                    self.logger.debug(f"Retrieved message for {sendercompid}->{targetcompid} Seq={msgseqnum}")
-                    return result[0]
-                else:
-                    self.logger.debug(f"No message found for {sendercompid}->{targetcompid} Seq={msgseqnum}")
-                    return None
+                count = await self._run(_insert_rows, self.conn, rows)
+                await self._commit()
+                self.logger.debug("Stored %s messages in one batch", count)
             except Exception as e:
-                self.logger.error(f"Error retrieving message for Seq={msgseqnum}: {e}", exc_info=True)
+                # _insert_rows already rolled back to its savepoint; other pending rows are kept
+                self.logger.error("Error storing message batch: %s", e, exc_info=True)
+
+    async def store_and_advance(self, msgseqnum, message):
+        """Store an outgoing message of this store's session and advance the next outgoing sequence number under one lock.
+
+        The insert and the session row update always land in the same commit, so a crash can
+        never persist one without the other. The message is already on the wire, so its sequence
+        number is consumed even when it cannot be stored (a later resend gap-fills it).
+        """
+        if self._closed:
+            self.outgoing_seqnum += 1
+            self.logger.warning("Attempted to store message after DB was closed.")
+            return
+        async with self._lock:
+            self.outgoing_seqnum += 1
+            self._seqnum_dirty = True
+            try:
+                await self._run(self.conn.execute, SQL_STORE_MESSAGE, self._session_key + (msgseqnum, message))
+                self._uncommitted += 1
+                self.logger.debug("Stored message: %s->%s Seq=%s; next outgoing is %s", self.sendercompid, self.targetcompid, msgseqnum, self.outgoing_seqnum)
+            except Exception as e:
+                # SQLite undoes just the failed statement; rows already pending in the shared batch stay
+                self.logger.error("Error storing message for Seq=%s: %s", msgseqnum, e, exc_info=True)
+            if self._uncommitted >= self.commit_batch_size:
+                await self.save_sequence_numbers()
+            else:
+                self._schedule_flush()
+
+    async def get_message(self, beginstring, sendercompid, targetcompid, msgseqnum):
+        try:
+            result = await self._read(_fetchone, SQL_GET_MESSAGE, (beginstring, sendercompid, targetcompid, msgseqnum))
+            if result:
+                self.logger.debug("Retrieved message for %s->%s Seq=%s", sendercompid, targetcompid, msgseqnum)
+                return result[0]
+            else:
+                self.logger.debug("No message found for %s->%s Seq=%s", sendercompid, targetcompid, msgseqnum)
                 return None
+        except Exception as e:
+            self.logger.error("Error retrieving message for Seq=%s: %s", msgseqnum, e, exc_info=True)
+            return None
+
+    async def get_messages_range(self, beginstring, sendercompid, targetcompid, begin_seq_num, end_seq_num):
+        """Return {msgseqnum: message} for every stored message in [begin_seq_num, end_seq_num] in one query."""
+        try:
+            return dict(await self._read(
+                _fetchall, SQL_GET_MESSAGE_RANGE,
+                (beginstring, sendercompid, targetcompid, begin_seq_num, end_seq_num)
+            ))
+        except Exception as e:
+            self.logger.error("Error retrieving messages %s-%s: %s", begin_seq_num, end_seq_num, e, exc_info=True)
+            return {}
 
     async def load_sequence_numbers(self):
         if self.beginstring and self.sendercompid and self.targetcompid:
             try:
-                cursor = self.conn.cursor()
-                cursor.execute('''
-                    SELECT next_incoming_seqnum, next_outgoing_seqnum FROM sessions WHERE
-                    beginstring = ? AND sendercompid = ? AND targetcompid = ?
-                ''', (self.beginstring, self.sendercompid, self.targetcompid))
-                result = cursor.fetchone()
+                result = await self._run(
+                    _fetchone, self.conn, SQL_LOAD_SEQUENCE_NUMBERS, self._session_key
+                )
                 if result:
-                    self.logger.debug(f"Loaded sequence numbers from DB: NextIncoming={result[0]}, NextOutgoing={result[1]}")
+                    self._session_rowid = result[2]
+                    self.logger.debug("Loaded sequence numbers from DB: NextIncoming=%s, NextOutgoing=%s", result[0], result[1])
                     return int(result[0]), int(result[1]) 
             except Exception as e:
-                self.logger.error(f"Error loading sequence numbers: {e}", exc_info=True)
+                self.logger.error("Error loading sequence numbers: %s", e, exc_info=True)
         self.logger.debug("No sequence numbers found in DB for session, defaulting to 1,1 (next expected).")
         return 1, 1 
 
@@ -109,23 +404,61 @@ class DatabaseMessageStore:
             self.logger.warning("Cannot save sequence numbers: session identifiers not set.")
             return
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('''
-                INSERT INTO sessions (beginstring, sendercompid, targetcompid, creation_time, next_incoming_seqnum, next_outgoing_seqnum)
-                VALUES (?, ?, ?, ?, ?, ?)
-                ON CONFLICT(beginstring, sendercompid, targetcompid)
-                DO UPDATE SET next_incoming_seqnum = excluded.next_incoming_seqnum, 
-                              next_outgoing_seqnum = excluded.next_outgoing_seqnum,
-                              creation_time = CASE WHEN excluded.next_incoming_seqnum = 1 AND excluded.next_outgoing_seqnum = 1 
-                                                   THEN excluded.creation_time 
-                                                   ELSE creation_time END
-            ''', (self.beginstring, self.sendercompid, self.targetcompid, 
-                  datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S"),
-                  self.incoming_seqnum, self.outgoing_seqnum))
-            self.conn.commit()
-            self.logger.debug(f"Saved sequence numbers: Next Incoming={self.incoming_seqnum}, Next Outgoing={self.outgoing_seqnum}")
+            if self._session_rowid is None:
+                self._session_rowid = await self._run(
+                    _upsert_session, self.conn,
+                    self._session_key + (epoch_micros(), self.incoming_seqnum, self.outgoing_seqnum)
+                )
+            else:
+                await self._run(self.conn.execute, SQL_UPDATE_SEQUENCE_NUMBERS,
+                                (self.incoming_seqnum, self.outgoing_seqnum, self._session_rowid))
+            await self._commit()
+            self._seqnum_dirty = False
+            self.logger.debug("Saved sequence numbers: Next Incoming=%s, Next Outgoing=%s", self.incoming_seqnum, self.outgoing_seqnum)
         except Exception as e:
-            self.logger.error(f"Error saving sequence numbers: {e}", exc_info=True)
+            self.logger.error("Error saving sequence numbers: %s", e, exc_info=True)
+
+    async def _commit(self):
+        await self._run(self.conn.commit)
+        self._uncommitted = 0
+
+    def _schedule_flush(self):
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.ensure_future(self._delayed_sequence_flush())
+
+    def _schedule_sequence_flush(self):
+        self._seqnum_dirty = True
+        self._schedule_flush()
+
+    async def _delayed_sequence_flush(self):
+        await asyncio.sleep(self.seqnum_flush_interval)
+        await self.flush_sequence_numbers()
+
+    async def checkpoint(self, mode='PASSIVE'):
+        """Run a WAL checkpoint; returns (busy, wal_pages, checkpointed_pages) or None if a transaction is open."""
+        async with self._lock:
+            if not self.conn:
+                return None
+            try:
+                return await self._run(_checkpoint, self.conn, mode)
+            except Exception as e:
+                self.logger.warning("WAL checkpoint (%s) failed: %s", mode, e)
+                return None
+
+    async def _checkpoint_loop(self):
+        while True:
+            await asyncio.sleep(self.checkpoint_interval)
+            await self.checkpoint()
+
+    async def flush_sequence_numbers(self):
+        """Persist sequence numbers and commit stored messages now if anything is still pending."""
+        async with self._lock:
+            if not self.conn:
+                return
+            if self._seqnum_dirty:
+                await self.save_sequence_numbers()
+            if self._uncommitted:
+                await self._commit()
 
     def get_next_incoming_sequence_number(self) -> int:
         return self.incoming_seqnum
@@ -133,8 +466,8 @@ class DatabaseMessageStore:
     async def increment_incoming_sequence_number(self):
         async with self._lock:
             self.incoming_seqnum += 1
-            await self.save_sequence_numbers()
-            self.logger.debug(f"Incremented incoming sequence. Next expected is now: {self.incoming_seqnum}")
+            self._schedule_sequence_flush()
+            self.logger.debug("Incremented incoming sequence. Next expected is now: %s", self.incoming_seqnum)
 
     def get_next_outgoing_sequence_number(self) -> int:
         return self.outgoing_seqnum
@@ -142,43 +475,60 @@ class DatabaseMessageStore:
     async def increment_outgoing_sequence_number(self):
         async with self._lock:
             self.outgoing_seqnum += 1
-            await self.save_sequence_numbers()
-            self.logger.debug(f"Incremented outgoing sequence. Next to be used is now: {self.outgoing_seqnum}")
+            self._schedule_sequence_flush()
+            self.logger.debug("Incremented outgoing sequence. Next to be used is now: %s", self.outgoing_seqnum)
 
     async def set_incoming_sequence_number(self, number: int):
-        if not isinstance(number, int) or number < 1:
-            self.logger.error(f"Invalid attempt to set incoming sequence number to: {number}")
+        try:
+            seqnum = number.__index__()  # ints return themselves; str/float/None have no __index__
+        except AttributeError:
+            seqnum = 0
+        if seqnum < 1:
+            self.logger.error("Invalid attempt to set incoming sequence number to: %s", number)
             return
         async with self._lock:
-            self.incoming_seqnum = number
+            self.incoming_seqnum = seqnum
             await self.save_sequence_numbers()
-            self.logger.info(f"Next incoming sequence number set to: {self.incoming_seqnum}")
+            self.logger.info("Next incoming sequence number set to: %s", self.incoming_seqnum)
 
     async def set_outgoing_sequence_number(self, number: int):
-        if not isinstance(number, int) or number < 1:
-            self.logger.error(f"Invalid attempt to set outgoing sequence number to: {number}")
+        try:
+            seqnum = number.__index__()  # ints return themselves; str/float/None have no __index__
+        except AttributeError:
+            seqnum = 0
+        if seqnum < 1:
+            self.logger.error("Invalid attempt to set outgoing sequence number to: %s", number)
             return
         async with self._lock:
-            self.outgoing_seqnum = number
+            self.outgoing_seqnum = seqnum
             await self.save_sequence_numbers()
-            self.logger.info(f"Next outgoing sequence number set to: {self.outgoing_seqnum}")
+            self.logger.info("Next outgoing sequence number set to: %s", self.outgoing_seqnum)
 
     async def reset_sequence_numbers(self):
-        self.logger.info(f"Resetting sequence numbers for session {self.beginstring}-{self.sendercompid}-{self.targetcompid} to 1.")
+        self.logger.info("Resetting sequence numbers for session %s-%s-%s to 1.", self.beginstring, self.sendercompid, self.targetcompid)
         async with self._lock:
             self.incoming_seqnum = 1
             self.outgoing_seqnum = 1
-            await self.save_sequence_numbers()
+            if self._session_rowid is None:
+                await self.save_sequence_numbers()
+                return
+            try:
+                # A reset starts a new session lifetime, so it is the only write that moves creation_time
+                await self._run(self.conn.execute, SQL_RESET_SESSION, (epoch_micros(), self._session_rowid))
+                await self._commit()
+                self._seqnum_dirty = False
+            except Exception as e:
+                self.logger.error("Error resetting sequence numbers: %s", e, exc_info=True)
 
     def is_new_session(self) -> bool:
         is_new = (self.incoming_seqnum == 1 and self.outgoing_seqnum == 1)
-        self.logger.debug(f"is_new_session check: NextIncoming={self.incoming_seqnum}, NextOutgoing={self.outgoing_seqnum}. Is new? {is_new}")
+        self.logger.debug("is_new_session check: NextIncoming=%s, NextOutgoing=%s. Is new? %s", self.incoming_seqnum, self.outgoing_seqnum, is_new)
         return is_new
 
     def get_current_outgoing_sequence_number(self) -> int:
         if self.outgoing_seqnum > 1:
             last_used = self.outgoing_seqnum - 1
-            self.logger.debug(f"get_current_outgoing_sequence_number: NextOutgoing is {self.outgoing_seqnum}, so current (last used) is {last_used}")
+            self.logger.debug("get_current_outgoing_sequence_number: NextOutgoing is %s, so current (last used) is %s", self.outgoing_seqnum, last_used)
             return last_used
         else:
             self.logger.debug("get_current_outgoing_sequence_number: NextOutgoing is 1, so no messages sent yet in this context. Returning 0.")
@@ -186,21 +536,38 @@ class DatabaseMessageStore:
 
     async def shutdown(self):
         """
-        Wait for all pending DB operations to finish before closing the DB.
+        Flush pending sequence numbers and wait for all DB operations to finish before closing the DB.
         Call this before close() during shutdown.
         """
-        async with self._lock:
-            pass  # Ensures all other operations using the lock are done
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+        if self._checkpoint_task and not self._checkpoint_task.done():
+            self._checkpoint_task.cancel()
+        await self.flush_sequence_numbers()  # Also waits for any operation holding the lock
 
     async def close(self):
         """
         Async close: ensures all pending DB operations are finished before closing the DB.
-        Always call this with 'await'.
+        Always call this with 'await'. Further calls are no-ops, and stores after close are dropped with a warning.
         """
+        if self._closed:
+            return
+        self._closed = True
         await self.shutdown()
         if self.conn:
-            self.conn.close()
+            async with self._lock:
+                # Commits the shared transaction, rows other stores on the file have pending included
+                await self._commit()
+                last_user = self._shared.users == 1
+            if last_user and self.db_path != ':memory:':
+                await self.checkpoint('TRUNCATE')  # leave an empty WAL behind on exit
+            _release_connection(self._shared)
             self.conn = None
+            if self._read_pool is not None:
+                self._read_executor.shutdown(wait=True)
+                while not self._read_pool.empty():
+                    self._read_pool.get_nowait().close()
+                self._read_pool = None
             self.logger.info("Database connection closed.")
 
 # Example usage (updated to reflect new get_next/increment pattern)
@@ -1,14 +1,48 @@
 import aiosqlite
-from datetime import datetime, UTC
 import logging
 import asyncio
 import os
+from pyfixmsg_plus.fixengine.database_message_store import CONNECTION_PRAGMAS, epoch_micros
+
+# One constant per statement: the connection's statement cache is keyed by SQL text, so each
+# is compiled once per connection and reused for every message. They are run through
+# Connection.execute/execute_fetchall, one worker-thread hop each (no cursor create/close hops).
+SQL_STORE_MESSAGE = (
+    "INSERT OR REPLACE INTO messages (beginstring, sendercompid, targetcompid, msgseqnum, message, timestamp) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+SQL_GET_MESSAGE = (
+    "SELECT message FROM messages WHERE beginstring = ? AND sendercompid = ? AND targetcompid = ? AND msgseqnum = ?"
+)
+SQL_GET_MESSAGE_RANGE = (
+    "SELECT msgseqnum, message FROM messages WHERE beginstring = ? AND sendercompid = ? AND targetcompid = ? "
+    "AND msgseqnum BETWEEN ? AND ? ORDER BY msgseqnum"
+)
+SQL_LOAD_SEQUENCE_NUMBERS = (
+    "SELECT next_incoming_seqnum, next_outgoing_seqnum, rowid FROM sessions "
+    "WHERE beginstring = ? AND sendercompid = ? AND targetcompid = ?"
+)
+SQL_SAVE_SEQUENCE_NUMBERS = """
+                INSERT INTO sessions (beginstring, sendercompid, targetcompid, creation_time, next_incoming_seqnum, next_outgoing_seqnum)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(beginstring, sendercompid, targetcompid) DO UPDATE SET
+                    next_incoming_seqnum=excluded.next_incoming_seqnum,
+                    next_outgoing_seqnum=excluded.next_outgoing_seqnum
+                """
+SQL_SESSION_ROWID = "SELECT rowid FROM sessions WHERE beginstring = ? AND sendercompid = ? AND targetcompid = ?"
+# Once the session row exists it is addressed by rowid: no conflict resolution per save
+SQL_UPDATE_SEQUENCE_NUMBERS = "UPDATE sessions SET next_incoming_seqnum = ?, next_outgoing_seqnum = ? WHERE rowid = ?"
+SQL_RESET_SESSION = (
+    "UPDATE sessions SET next_incoming_seqnum = 1, next_outgoing_seqnum = 1, creation_time = ? WHERE rowid = ?"
+)
+
 
 class DatabaseMessageStoreAioSqlite:
     """
     An asynchronous message store implementation using aiosqlite.
     """
-    def __init__(self, db_path, beginstring=None, sendercompid=None, targetcompid=None):
+    def __init__(self, db_path, beginstring=None, sendercompid=None, targetcompid=None, seqnum_flush_interval=0.25,
+                 commit_batch_size=256):
         self.db_path = db_path
         db_dir = os.path.dirname(db_path)
         if db_dir and not os.path.exists(db_dir):
@@ -19,73 +53,181 @@ class DatabaseMessageStoreAioSqlite:
         self.beginstring = beginstring
         self.sendercompid = sendercompid
         self.targetcompid = targetcompid
+        # Fixed for the store's lifetime: packed once and prefixed onto every session-keyed bind tuple
+        self._session_key = (beginstring, sendercompid, targetcompid)
         self.incoming_seqnum = 1
         self.outgoing_seqnum = 1
+        self._session_rowid = None
+        # Increments only touch memory; the sessions row is rewritten at most once per interval
+        self.seqnum_flush_interval = seqnum_flush_interval
+        self._seqnum_dirty = False
+        self._flush_task = None
+        # Stored messages share one transaction that is committed by the same timer (or once
+        # commit_batch_size rows are pending) rather than a commit per message
+        self.commit_batch_size = commit_batch_size
+        self._uncommitted = 0
+        self._closed = False
 
     async def initialize(self):
+        # MessageStoreFactory already initializes; a second call (e.g. FixEngine.initialize()) used to
+        # open another connection and reload the counters over unflushed increments
+        if self.conn is not None:
+            return
         self.conn = await aiosqlite.connect(self.db_path)
+        self.conn.row_factory = None  # plain tuples; the store indexes rows positionally
+        for pragma in CONNECTION_PRAGMAS:
+            await self.conn.execute(pragma)
         await self.create_table()
         if self.beginstring and self.sendercompid and self.targetcompid:
             loaded_in, loaded_out = await self.load_sequence_numbers()
             self.incoming_seqnum = loaded_in
             self.outgoing_seqnum = loaded_out
-            self.logger.info(f"Loaded sequence numbers for session {self.beginstring}-{self.sendercompid}-{self.targetcompid}: NextIncoming={self.incoming_seqnum}, NextOutgoing={self.outgoing_seqnum}")
+            self.logger.info("Loaded sequence numbers for session %s-%s-%s: NextIncoming=%s, NextOutgoing=%s", self.beginstring, self.sendercompid, self.targetcompid, self.incoming_seqnum, self.outgoing_seqnum)
         else:
             self.logger.info("Session identifiers not set at init. Defaulting sequence numbers to 1.")
 
     async def store_message(self, beginstring, sendercompid, targetcompid, msgseqnum, message):
-        if not self.conn:
+        if self._closed or not self.conn:
+            self.logger.warning("Attempted to store message after DB was closed.")
+            return
+        async with self._lock:
+            await self.conn.execute(
+                SQL_STORE_MESSAGE,
+                (beginstring, sendercompid, targetcompid, msgseqnum, message, epoch_micros())
+            )
+            self._uncommitted += 1
+            if self._uncommitted >= self.commit_batch_size:
+                await self._commit()
+            else:
+                self._schedule_flush()
+
+    async def store_messages(self, rows):
+        """Store many (beginstring, sendercompid, targetcompid, msgseqnum, message) rows with one executemany and one commit."""
+        if self._closed or not self.conn:
+            self.logger.warning("Attempted to store messages after DB was closed.")
+            return
+        now = epoch_micros()
+        async with self._lock:
+            # A savepoint confines a failure to this batch; rows already pending in the transaction stay
+            if not self.conn.in_transaction:
+                await self.conn.execute("BEGIN")
+            await self.conn.execute("SAVEPOINT store_messages")
+            try:
+                await self.conn.executemany(SQL_STORE_MESSAGE, (row + (now,) for row in rows))
+            except Exception as e:
+                await self.conn.execute("ROLLBACK TO store_messages")
+                await self.conn.execute("RELEASE store_messages")
+                self.logger.error("Error storing message batch: %s", e, exc_info=True)
+                return
+            await self.conn.execute("RELEASE store_messages")
+            await self._commit()
+
+    async def store_and_advance(self, msgseqnum, message):
+        """Store an outgoing message of this store's session and advance the next outgoing sequence number in the same commit.
+
+        The message is already on the wire, so its sequence number is consumed even when it cannot be stored.
+        """
+        if self._closed or not self.conn:
+            self.outgoing_seqnum += 1
             self.logger.warning("Attempted to store message after DB was closed.")
             return
         async with self._lock:
-            async with self.conn.cursor() as cursor:
-                await cursor.execute(
-                    "INSERT OR REPLACE INTO messages (beginstring, sendercompid, targetcompid, msgseqnum, message, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
-                    (beginstring, sendercompid, targetcompid, msgseqnum, message, datetime.now(UTC))
+            self.outgoing_seqnum += 1
+            self._seqnum_dirty = True
+            try:
+                await self.conn.execute(
+                    SQL_STORE_MESSAGE,
+                    self._session_key + (msgseqnum, message, epoch_micros())
                 )
-            await self.conn.commit()
+                self._uncommitted += 1
+            except Exception as e:
+                # SQLite undoes just the failed statement; rows already pending in the batch stay
+                self.logger.error("Error storing message for Seq=%s: %s", msgseqnum, e, exc_info=True)
+            if self._uncommitted >= self.commit_batch_size:
+                await self.save_sequence_numbers()
+            else:
+                self._schedule_flush()
 
     async def get_message(self, beginstring, sendercompid, targetcompid, msgseqnum):
         if not self.conn:
             self.logger.warning("Attempted to get message after DB was closed.")
             return None
         async with self._lock:
-            async with self.conn.cursor() as cursor:
-                await cursor.execute(
-                    "SELECT message FROM messages WHERE beginstring = ? AND sendercompid = ? AND targetcompid = ? AND msgseqnum = ?",
-                    (beginstring, sendercompid, targetcompid, msgseqnum)
-                )
-                row = await cursor.fetchone()
-                return row[0] if row else None
+            rows = await self.conn.execute_fetchall(
+                SQL_GET_MESSAGE,
+                (beginstring, sendercompid, targetcompid, msgseqnum)
+            )
+            return rows[0][0] if rows else None
+
+    async def get_messages_range(self, beginstring, sendercompid, targetcompid, begin_seq_num, end_seq_num):
+        """Return {msgseqnum: message} for every stored message in [begin_seq_num, end_seq_num] in one query."""
+        if not self.conn:
+            self.logger.warning("Attempted to get messages after DB was closed.")
+            return {}
+        async with self._lock:
+            return dict(await self.conn.execute_fetchall(
+                SQL_GET_MESSAGE_RANGE,
+                (beginstring, sendercompid, targetcompid, begin_seq_num, end_seq_num)
+            ))
 
     async def load_sequence_numbers(self):
         if not self.conn:
             self.logger.warning("Attempted to load sequence numbers after DB was closed.")
             return (1, 1)
-        async with self.conn.cursor() as cursor:
-            await cursor.execute(
-                "SELECT next_incoming_seqnum, next_outgoing_seqnum FROM sessions WHERE beginstring = ? AND sendercompid = ? AND targetcompid = ?",
-                (self.beginstring, self.sendercompid, self.targetcompid)
-            )
-            row = await cursor.fetchone()
-            return (int(row[0]), int(row[1])) if row else (1, 1)
+        rows = await self.conn.execute_fetchall(
+            SQL_LOAD_SEQUENCE_NUMBERS,
+            self._session_key
+        )
+        if not rows:
+            return (1, 1)
+        self._session_rowid = rows[0][2]
+        return (int(rows[0][0]), int(rows[0][1]))
 
     async def save_sequence_numbers(self):
         if not self.conn:
             self.logger.warning("Attempted to save sequence numbers after DB was closed.")
             return
-        async with self.conn.cursor() as cursor:
-            await cursor.execute(
-                """
-                INSERT INTO sessions (beginstring, sendercompid, targetcompid, creation_time, next_incoming_seqnum, next_outgoing_seqnum)
-                VALUES (?, ?, ?, ?, ?, ?)
-                ON CONFLICT(beginstring, sendercompid, targetcompid) DO UPDATE SET
-                    next_incoming_seqnum=excluded.next_incoming_seqnum,
-                    next_outgoing_seqnum=excluded.next_outgoing_seqnum
-                """,
-                (self.beginstring, self.sendercompid, self.targetcompid, datetime.now(UTC), self.incoming_seqnum, self.outgoing_seqnum)
+        if self._session_rowid is None:
+            await self.conn.execute(
+                SQL_SAVE_SEQUENCE_NUMBERS,
+                self._session_key + (epoch_micros(), self.incoming_seqnum, self.outgoing_seqnum)
+            )
+            rows = await self.conn.execute_fetchall(
+                SQL_SESSION_ROWID, self._session_key
             )
+            self._session_rowid = rows[0][0]
+        else:
+            await self.conn.execute(
+                SQL_UPDATE_SEQUENCE_NUMBERS, (self.incoming_seqnum, self.outgoing_seqnum, self._session_rowid)
+            )
+        await self._commit()
+        self._seqnum_dirty = False
+
+    async def _commit(self):
         await self.conn.commit()
+        self._uncommitted = 0
+
+    def _schedule_flush(self):
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.ensure_future(self._delayed_sequence_flush())
+
+    def _schedule_sequence_flush(self):
+        self._seqnum_dirty = True
+        self._schedule_flush()
+
+    async def _delayed_sequence_flush(self):
+        await asyncio.sleep(self.seqnum_flush_interval)
+        await self.flush_sequence_numbers()
+
+    async def flush_sequence_numbers(self):
+        """Persist sequence numbers and commit stored messages now if anything is still pending."""
+        async with self._lock:
+            if not self.conn:
+                return
+            if self._seqnum_dirty:
+                await self.save_sequence_numbers()
+            if self._uncommitted:
+                await self._commit()
 
     async def create_table(self):
         if not self.conn:
@@ -95,14 +237,14 @@ class DatabaseMessageStoreAioSqlite:
             await cursor.execute('''
                 CREATE TABLE IF NOT EXISTS messages (
                     beginstring TEXT, sendercompid TEXT, targetcompid TEXT, 
-                    msgseqnum INTEGER, message TEXT, timestamp DATETIME,
+                    msgseqnum INTEGER, message BLOB, timestamp INTEGER,
                     PRIMARY KEY (beginstring, sendercompid, targetcompid, msgseqnum)
                 )
             ''')
             await cursor.execute('''
                 CREATE TABLE IF NOT EXISTS sessions (
                     beginstring TEXT, sendercompid TEXT, targetcompid TEXT,
-                    creation_time TEXT, next_incoming_seqnum INTEGER, next_outgoing_seqnum INTEGER,
+                    creation_time INTEGER, next_incoming_seqnum INTEGER, next_outgoing_seqnum INTEGER,
                     PRIMARY KEY (beginstring, sendercompid, targetcompid)
                 )
             ''')
@@ -114,7 +256,7 @@ class DatabaseMessageStoreAioSqlite:
     async def increment_incoming_sequence_number(self):
         async with self._lock:
             self.incoming_seqnum += 1
-            await self.save_sequence_numbers()
+            self._schedule_sequence_flush()
 
     def get_next_outgoing_sequence_number(self) -> int:
         return self.outgoing_seqnum
@@ -122,7 +264,7 @@ class DatabaseMessageStoreAioSqlite:
     async def increment_outgoing_sequence_number(self):
         async with self._lock:
             self.outgoing_seqnum += 1
-            await self.save_sequence_numbers()
+            self._schedule_sequence_flush()
 
     async def set_incoming_sequence_number(self, number: int):
         async with self._lock:
@@ -138,20 +280,30 @@ class DatabaseMessageStoreAioSqlite:
         async with self._lock:
             self.incoming_seqnum = 1
             self.outgoing_seqnum = 1
-            await self.save_sequence_numbers()
+            if self._session_rowid is None or not self.conn:
+                await self.save_sequence_numbers()
+                return
+            await self.conn.execute(SQL_RESET_SESSION, (epoch_micros(), self._session_rowid))
+            await self._commit()
+            self._seqnum_dirty = False
 
     def get_current_outgoing_sequence_number(self) -> int:
         return self.outgoing_seqnum - 1 if self.outgoing_seqnum > 1 else 0
 
     async def shutdown(self):
         """
-        Wait for all pending DB operations to finish before closing the DB.
+        Flush pending sequence numbers and wait for all DB operations to finish before closing the DB.
         Call this before close() during shutdown.
         """
-        async with self._lock:
-            pass  # Ensures all other operations using the lock are done
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+        await self.flush_sequence_numbers()  # Also waits for any operation holding the lock
 
     async def close(self):
+        # Idempotent; stores arriving once closing has started are dropped rather than left uncommitted
+        if self._closed:
+            return
+        self._closed = True
         # Call shutdown() before closing to ensure all DB ops are done
         await self.shutdown()
         if self.conn:
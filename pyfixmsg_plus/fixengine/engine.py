@@ -1,11 +1,16 @@
 import asyncio
+import collections
 import inspect
 import logging
+import os
+import re
+import sys
+import time
 from datetime import datetime, timezone
 from pyfixmsg_plus.fixengine.heartbeat_builder import HeartbeatBuilder
 from pyfixmsg_plus.fixengine.testrequest import TestRequest 
 from pyfixmsg_plus.fixengine.network import Acceptor, Initiator
-from pyfixmsg_plus.fixengine.configmanager import ConfigManager
+from pyfixmsg_plus.fixengine.configmanager import ConfigManager, config_flag
 from pyfixmsg_plus.fixengine.message_handler import (
     MessageProcessor,
     LogonHandler,
@@ -32,6 +37,77 @@ from pyfixmsg.reference import FixSpec
 from pyfixmsg.codecs.stringfix import Codec
 from typing import Optional,Any
 
+SOH = b'\x01'
+BEGIN_STRING_PREFIX = b"8=FIX"
+BODY_LENGTH_TAG = SOH + b"9="
+CHECKSUM_TAG = SOH + b"10="
+# MsgType, MsgSeqNum and PossDupFlag: enough to drop or queue a message at the sequence check
+SEQUENCE_FIELDS_RE = re.compile(rb"\x01(34|35|43)=([^\x01]*)")
+
+# [FIX] options loaded onto the engine at construction: (attribute, option, coercion, default)
+ENGINE_CONFIG_OPTIONS = (
+    ('host', 'host', str, '127.0.0.1'),
+    ('port', 'port', int, '5000'),
+    ('sender', 'sender', str, 'SENDER'),
+    ('target', 'target', str, 'TARGET'),
+    ('version', 'version', str, 'FIX.4.4'),
+    ('spec_filename', 'spec_filename', str, 'FIX44.xml'),
+    ('use_tls', 'use_tls', config_flag, 'false'),
+    ('mode', 'mode', str.lower, 'initiator'),
+    ('heartbeat_interval', 'heartbeat_interval', int, '30'),
+    ('retry_interval', 'retry_interval', int, '5'),
+    ('max_retries', 'max_retries', int, '5'),
+    ('reset_seq_num_on_logon', 'reset_seq_num_on_logon', config_flag, 'false'),
+    ('encrypt_method', 'encryptmethod', int, '0'),
+)
+
+# Parsed FIX dictionaries shared by every engine in the process. The class is part of the key
+# so a substituted FixSpec (e.g. a test double) never picks up another's cached instance.
+_SPEC_CACHE = {}
+
+
+def load_spec(spec_filename: str) -> FixSpec:
+    """Return the FixSpec for spec_filename, parsing the XML only the first time it is requested."""
+    key = (FixSpec, os.path.realpath(spec_filename))
+    spec = _SPEC_CACHE.get(key)
+    if spec is None:
+        spec = _SPEC_CACHE[key] = FixSpec(spec_filename)
+    return spec
+
+
+def fix_checksum(buf, end: int) -> int:
+    """Sum of the first ``end`` bytes of ``buf`` modulo 256, without copying the buffer."""
+    return sum(memoryview(buf)[:end]) & 0xFF
+
+
+# SendingTime is formatted at most once per millisecond; bursts reuse the cached string
+_sending_time_ms = -1
+_sending_time_str = ""
+
+
+def sending_time() -> str:
+    """Current UTC time as a FIX UTCTimestamp with milliseconds (YYYYMMDD-HH:MM:SS.sss)."""
+    global _sending_time_ms, _sending_time_str
+    now_ms = time.time_ns() // 1_000_000
+    if now_ms != _sending_time_ms:
+        seconds, millis = divmod(now_ms, 1000)
+        _sending_time_str = datetime.fromtimestamp(seconds, timezone.utc).strftime('%Y%m%d-%H:%M:%S') + '.%03d' % millis
+        _sending_time_ms = now_ms
+    return _sending_time_str
+
+
+def extract_sequence_fields(buf: bytes):
+    """Return (MsgType, MsgSeqNum, PossDupFlag) from a raw frame without a full parse."""
+    found = {}
+    for match in SEQUENCE_FIELDS_RE.finditer(buf):
+        found.setdefault(match.group(1), match.group(2))
+    seq_num = found.get(b"34")
+    msg_type = found.get(b"35")
+    return (
+        msg_type.decode() if msg_type is not None else None,
+        int(seq_num) if seq_num and seq_num.isdigit() else None,
+        found.get(b"43") == b"Y",
+    )
 
 class FixEngine:
     def __init__(
@@ -46,24 +122,18 @@ class FixEngine:
         self.state_machine = StateMachine(Disconnected()) 
         self.state_machine.subscribe(self.on_state_change)
         
-        self.host = self.config_manager.get('FIX', 'host', '127.0.0.1')
-        self.port = int(self.config_manager.get('FIX', 'port', '5000'))
-        self.sender = self.config_manager.get('FIX', 'sender', 'SENDER')
-        self.target = self.config_manager.get('FIX', 'target', 'TARGET')
-        self.version = self.config_manager.get('FIX', 'version', 'FIX.4.4')
-        self.spec_filename = self.config_manager.get('FIX', 'spec_filename', 'FIX44.xml')
-        self.use_tls = self.config_manager.get('FIX', 'use_tls', 'false').lower() == 'true'
-        self.mode = self.config_manager.get('FIX', 'mode', 'initiator').lower()
+        # One pass over the [FIX] section instead of a configparser lookup per option
+        fix_config = self.config_manager.get_section('FIX')
+        for attr, option, coerce, default in ENGINE_CONFIG_OPTIONS:
+            setattr(self, attr, coerce(fix_config.get(option, default)))
 
         self.logger = logging.getLogger('FixEngine')
 
-        db_path = self.config_manager.get('FIX', 'state_file', 'fix_state.db')
         self.message_store = None
 
         self._initial_incoming_seqnum = initial_incoming_seqnum
         self._initial_outgoing_seqnum = initial_outgoing_seqnum
 
-        self.heartbeat_interval = int(self.config_manager.get('FIX', 'heartbeat_interval', '30'))
         self.lock = asyncio.Lock()
         
         self.test_request = TestRequest(self.send_message, self.config_manager, self.fixmsg)
@@ -105,23 +175,24 @@ class FixEngine:
         self.scheduler = Scheduler(self.config_manager, self)
         self.scheduler_task = None
 
-        self.retry_interval = int(self.config_manager.get('FIX', 'retry_interval', '5'))
-        self.max_retries = int(self.config_manager.get('FIX', 'max_retries', '5'))
         self.retry_attempts = 0
+        # Logon body is fixed for the session; each (re)logon copies it and patches ResetSeqNumFlag
+        self._logon_fields = {141: 'N', 35: 'A', 108: self.heartbeat_interval, 98: self.encrypt_method}
 
-        self.spec = FixSpec(self.spec_filename)
+        self.spec = load_spec(self.spec_filename)
         self.codec = Codec(spec=self.spec, fragment_class=FixFragment)
-        self.incoming_buffer = b"" 
 
-        self.resend_request_outstanding = False
-        self.resend_request_expected_seq = None
+        # Messages that arrived ahead of a gap, replayed in order once the gap is filled
+        self.queued_while_resend = collections.deque(maxlen=128)
+        self._reset_session_state()
+        self._active_event = asyncio.Event()
+        self._logoff_event = asyncio.Event()
 
     def fixmsg(self, fields: dict) -> FixMessage:
         message = FixMessage(fields)
         message.codec = self.codec
         message[8] = self.version
-        if 52 not in fields:
-            fields[52] = datetime.now(timezone.utc).strftime('%Y%m%d-%H:%M:%S.%f')[:-3]
+        # SendingTime(52) is stamped by send_message; formatting it here was discarded work
         return message
 
     def create_message_with_repeating_group(
@@ -145,76 +216,96 @@ class FixEngine:
         return message
 
     def on_state_change(self, state_name: str) -> None:
-        self.logger.info(f"STATE CHANGE ({self.session_id}): {state_name}")
+        # One record per transition; ACTIVE and DISCONNECTED used to log a second, redundant line
+        self.logger.info("STATE CHANGE (%s): %s", self.session_id, state_name)
         if state_name == "ACTIVE": 
-            self.logger.info(f"Session {self.session_id} is now ACTIVE.")
             self.retry_attempts = 0
-        elif state_name == "DISCONNECTED": 
-            self.logger.info(f"Session {self.session_id} is DISCONNECTED.")
+            self._active_event.set()
+            return
+        self._active_event.clear()
+        if state_name == "DISCONNECTED": 
             if self.heartbeat and self.heartbeat.is_running():
                  self.logger.debug("Stopping heartbeat task due to disconnect.")
                  asyncio.create_task(self.heartbeat.stop())
-            self.incoming_buffer = b"" 
+            self._reset_session_state()
+
+    def _reset_session_state(self) -> None:
+        """Drop per-connection receive state: partial frames and any pending gap recovery."""
+        self.incoming_buffer = b""
+        self.resend_request_outstanding = False
+        self.resend_request_expected_seq = None
+        self.queued_while_resend.clear()
+
+    async def wait_until_active(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the session to reach ACTIVE; returns False if the timeout expires first."""
+        try:
+            await asyncio.wait_for(self._active_event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
 
     async def start(self) -> None:
         if not self.scheduler_task or self.scheduler_task.done():
             self.scheduler_task = asyncio.create_task(self.scheduler.run_scheduler())
             self.logger.info("Scheduler task started.")
-        self.incoming_buffer = b"" 
 
-        try:
-            if self.mode == 'acceptor':
-                self.logger.info(f"Acceptor starting on {self.host}:{self.port} for session {self.session_id}...")
-                await self.network.start_accepting(self.handle_incoming_connection)
-                self.logger.info(f"Acceptor {self.session_id} has stopped listening.")
-            else: 
-                self.logger.info(f"Initiator {self.session_id} starting to connect to {self.host}:{self.port}...")
-                self.state_machine.on_event('initiator_connect_attempt') 
-                await self.network.connect() 
-                self.logger.info(f"Initiator {self.session_id} TCP connected. Proceeding with FIX Logon.")
-                self.state_machine.on_event('connection_established') 
-                await self.logon()
-                await self.receive_message()
-        except ConnectionRefusedError as e:
-            self.logger.error(f"Connection refused for {self.session_id}: {e}")
-            if self.mode == 'initiator':
-                self.state_machine.on_event('connection_failed') 
-                await self.retry_connect()
-        except Exception as e:
-            self.logger.error(f"Failed to start or run FIX engine {self.session_id}: {e}", exc_info=True)
-            if self.mode == 'initiator':
-                self.state_machine.on_event('connection_failed') 
-                await self.retry_connect()
-        finally:
-            self.logger.info(f"FIX Engine {self.session_id} start/run attempt concluded.")
-
-    async def retry_connect(self) -> None:
-        if self.mode == 'acceptor': return
+        # Reconnect attempts loop here rather than recursing through retry_connect() -> start()
+        while True:
+            self._reset_session_state()
+            try:
+                if self.mode == 'acceptor':
+                    self.logger.info("Acceptor starting on %s:%s for session %s...", self.host, self.port, self.session_id)
+                    await self.network.start_accepting(self.handle_incoming_connection)
+                    self.logger.info("Acceptor %s has stopped listening.", self.session_id)
+                else: 
+                    self.logger.info("Initiator %s starting to connect to %s:%s...", self.session_id, self.host, self.port)
+                    self.state_machine.on_event('initiator_connect_attempt') 
+                    await self.network.connect() 
+                    self.logger.info("Initiator %s TCP connected. Proceeding with FIX Logon.", self.session_id)
+                    self.state_machine.on_event('connection_established') 
+                    await self.logon()
+                    await self.receive_message()
+            except Exception as e:
+                # A refused connection is routine for an initiator; only log the traceback for anything else
+                refused = isinstance(e, ConnectionRefusedError)
+                self.logger.error("%s for %s: %s", 'Connection refused' if refused else 'Failed to start or run FIX engine', self.session_id, e, exc_info=not refused)
+                if self.mode == 'initiator':
+                    self.state_machine.on_event('connection_failed') 
+                    if await self.retry_connect():
+                        continue
+            finally:
+                self.logger.info("FIX Engine %s start/run attempt concluded.", self.session_id)
+            break
+
+    async def retry_connect(self) -> bool:
+        """Wait out the backoff for the next reconnect attempt; returns False when no retry should be made."""
+        if self.mode == 'acceptor': return False
 
         if self.state_machine.state.name != "ACTIVE" and self.retry_attempts < self.max_retries:
             self.retry_attempts += 1
             self.state_machine.on_event('initiate_reconnect')
             backoff_time = self.retry_interval * (2 ** (self.retry_attempts - 1))
-            self.logger.info(f"Retrying connection for {self.session_id} in {backoff_time}s (Attempt {self.retry_attempts}/{self.max_retries}).")
+            self.logger.info("Retrying connection for %s in %ss (Attempt %s/%s).", self.session_id, backoff_time, self.retry_attempts, self.max_retries)
             await asyncio.sleep(backoff_time)
-            await self.start() 
+            return True
         elif self.retry_attempts >= self.max_retries:
-            self.logger.error(f"Max retries reached for {self.session_id}. Connection failed.")
+            self.logger.error("Max retries reached for %s. Connection failed.", self.session_id)
             self.state_machine.on_event('reconnect_failed_max_retries') 
         else:
-            self.logger.info(f"Not retrying connection for {self.session_id}, current state: {self.state_machine.state.name}")
+            self.logger.info("Not retrying connection for %s, current state: %s", self.session_id, self.state_machine.state.name)
+        return False
 
     async def handle_incoming_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
         client_address_info = writer.get_extra_info('peername')
         client_address = f"{client_address_info[0]}:{client_address_info[1]}" if client_address_info else "unknown client"
-        self.logger.info(f"Accepted connection from {client_address} for session {self.session_id}.")
+        self.logger.info("Accepted connection from %s for session %s.", client_address, self.session_id)
         self.logger.debug(f"FixEngine.handle_incoming_connection: reader_id={id(reader)}, writer_id={id(writer)} for client {client_address}")
-        self.incoming_buffer = b"" 
+        self._reset_session_state()
         try:
             await self.network.set_transport(reader, writer)
             self.state_machine.on_event('client_accepted_awaiting_logon') 
             self.retry_attempts = 0 
-            self.logger.info(f"Transport set for {client_address}. Waiting for Logon...")
+            self.logger.info("Transport set for %s. Waiting for Logon...", client_address)
             await self.receive_message()
         except ConnectionResetError:
             self.logger.warning(f"Connection reset by {client_address} during session {self.session_id}.")
@@ -223,7 +314,7 @@ class FixEngine:
         except Exception as e:
             self.logger.error(f"Error handling connection from {client_address} (session {self.session_id}): {e}", exc_info=True)
         finally:
-            self.logger.info(f"Cleaning up connection with {client_address} (session {self.session_id}).")
+            self.logger.info("Cleaning up connection with %s (session %s).", client_address, self.session_id)
             if writer and not writer.is_closing():
                 try:
                     writer.close()
@@ -232,9 +323,9 @@ class FixEngine:
                     self.logger.error(f"Error during writer.wait_closed() for {client_address}: {e_close}")
             
             if self.state_machine.state.name != "DISCONNECTED":
-                 self.logger.info(f"Setting state to DISCONNECTED after client {client_address} handling ended (main session: {self.session_id})")
+                 self.logger.info("Setting state to DISCONNECTED after client %s handling ended (main session: %s)", client_address, self.session_id)
                  self.state_machine.on_event('disconnect') 
-            self.logger.info(f"Connection with {client_address} (session {self.session_id}) ended.")
+            self.logger.info("Connection with %s (session %s) ended.", client_address, self.session_id)
 
     async def logon(self) -> None: 
         if self.mode == 'acceptor':
@@ -248,24 +339,16 @@ class FixEngine:
             return
 
         try:
-            logon_message = self.fixmsg({})
+            logon_message = self.fixmsg(self._logon_fields)
 
-            reset_seq_num_flag_config = self.config_manager.get('FIX', 'reset_seq_num_on_logon', 'false').lower() == 'true'
-
-            if reset_seq_num_flag_config:
-                self.logger.info(f"ResetSeqNumFlag is true for {self.session_id}. Resetting sequence numbers to 1.")
+            if self.reset_seq_num_on_logon:
+                self.logger.info("ResetSeqNumFlag is true for %s. Resetting sequence numbers to 1.", self.session_id)
                 await self.reset_sequence_numbers() 
                 logon_message[141] = 'Y'
-            else:
-                logon_message[141] = 'N'
 
-            logon_message.update({ 35: 'A', 108: self.heartbeat_interval })
-            encrypt_method = int(self.config_manager.get('FIX', 'encryptmethod', '0'))
-            logon_message[98] = encrypt_method
-
-            self.logger.info(f"Initiator {self.session_id} sending Logon (ResetSeqNumFlag={logon_message[141]}).")
+            self.logger.info("Initiator %s sending Logon (ResetSeqNumFlag=%s).", self.session_id, logon_message[141])
             await self.send_message(logon_message) 
-            self.logger.info(f"Initiator {self.session_id} Logon sent (SeqNum {logon_message.get(34)}). Waiting for response. Starting heartbeat mechanism.")
+            self.logger.info("Initiator %s Logon sent (SeqNum %s). Waiting for response. Starting heartbeat mechanism.", self.session_id, logon_message.get(34))
             if self.heartbeat: await self.heartbeat.start() 
 
         except Exception as e:
@@ -273,7 +356,7 @@ class FixEngine:
             self.state_machine.on_event('logon_failed') 
             await self.disconnect(graceful=False) 
 
-    async def send_message(self, message: FixMessage) -> None:
+    async def send_message(self, message: FixMessage, override_seqnum: Optional[int] = None) -> None:
         current_state_name = self.state_machine.state.name
         can_send_logon = (message.get(35) == 'A' and self.mode == 'initiator' and current_state_name == "LOGON_IN_PROGRESS")
 
@@ -283,11 +366,14 @@ class FixEngine:
 
         message[49] = self.sender
         message[56] = self.target
-        message[52] = datetime.now(timezone.utc).strftime('%Y%m%d-%H:%M:%S.%f')[:-3]
+        message[52] = sending_time()
 
         is_reset_logon = message.get(35) == 'A' and message.get(141) == 'Y'
 
-        if 34 not in message: 
+        if override_seqnum is not None:
+            # Resends and GapFills reuse an already-sent MsgSeqNum; the stored copy and the counter stay as they are
+            message[34] = override_seqnum
+        elif 34 not in message: 
             if is_reset_logon:
                 message[34] = 1
             else:
@@ -296,22 +382,19 @@ class FixEngine:
         wire_message = message.to_wire(codec=self.codec)
         try:
             await self.network.send(wire_message)
-            await self.message_store.store_message(
-                self.version, self.sender, self.target,
-                message[34], 
-                wire_message.decode(errors='replace')
-            )
-            
-            if hasattr(self.message_store, 'increment_outgoing_sequence_number'):
+            if override_seqnum is None:
                 if not is_reset_logon:
-                    await self.message_store.increment_outgoing_sequence_number()
-                else: 
+                    await self.message_store.store_and_advance(message[34], wire_message)
+                else:
+                    await self.message_store.store_message(
+                        self.version, self.sender, self.target,
+                        message[34],
+                        wire_message
+                    )
                     await self.message_store.set_outgoing_sequence_number(2)
-            elif not is_reset_logon:
-                self.logger.debug("MessageStore does not have increment_outgoing_sequence_number. Assuming get_next or internal logic handles it.")
 
-            self.logger.info(f"Sent ({self.session_id}): {message.get(35)} (SeqNum {message.get(34)})")
-            if message.get(35) != '0' or self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.info("Sent (%s): %s (SeqNum %s)", self.session_id, message.get(35), message.get(34))
+            if self.logger.isEnabledFor(logging.DEBUG):
                  self.logger.debug(f"Sent Details ({self.session_id}): {str(message)}")
 
         except ConnectionResetError as e:
@@ -341,45 +424,57 @@ class FixEngine:
             self.logger.info(f"FixEngine's receive_message loop for {self.session_id} has ended.")
 
     async def on_network_data(self, data_bytes: bytes) -> None:
-        self.incoming_buffer += data_bytes
-        self.logger.debug(f"Received {len(data_bytes)} bytes. Buffer size: {len(self.incoming_buffer)}")
-        
+        buffer = self.incoming_buffer + data_bytes
+        self.incoming_buffer = buffer
+        # Bound once per read; the framing loop below runs once per message in the buffer
+        logger = self.logger
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        process_message = self.process_single_fix_message
+        queued = self.queued_while_resend
+        find = buffer.find
+        buffer_len = len(buffer)
+        if debug_enabled:
+            logger.debug("Received %s bytes. Buffer size: %s", len(data_bytes), buffer_len)
+
+        # Frames are located by offset into one buffer and the consumed prefix is dropped once at
+        # the end, rather than re-slicing the remainder after every message (quadratic for large reads).
+        pos = 0
         while True:
             try:
-                begin_string_index = self.incoming_buffer.find(b"8=FIX")
+                begin_string_index = find(BEGIN_STRING_PREFIX, pos)
                 if begin_string_index == -1:
-                    self.logger.debug("No '8=FIX' found in buffer. Waiting for more data.")
-                    if len(self.incoming_buffer) > 8192:
-                        self.logger.error("Buffer grew very large without '8=FIX'. Discarding buffer.")
-                        self.incoming_buffer = b""
+                    logger.debug("No '8=FIX' found in buffer. Waiting for more data.")
+                    if buffer_len - pos > 8192:
+                        logger.error("Buffer grew very large without '8=FIX'. Discarding buffer.")
+                        pos = buffer_len
                     break 
 
-                if begin_string_index > 0:
-                    self.logger.warning(f"Discarding {begin_string_index} bytes of garbage data before '8=FIX': {self.incoming_buffer[:begin_string_index].decode(errors='replace')}")
-                    self.incoming_buffer = self.incoming_buffer[begin_string_index:]
+                if begin_string_index > pos:
+                    logger.warning("Discarding %s bytes of garbage data before '8=FIX': %s", begin_string_index - pos, buffer[pos:begin_string_index].decode(errors='replace'))
+                    pos = begin_string_index
 
-                soh = b'\x01'
-                body_length_tag_index = self.incoming_buffer.find(soh + b"9=")
+                body_length_tag_index = find(BODY_LENGTH_TAG, pos)
                 if body_length_tag_index == -1:
-                    self.logger.debug("Found '8=FIX' but no '9=' (BodyLength) yet. Buffer might be incomplete.")
-                    if len(self.incoming_buffer) > 4096: 
-                        self.logger.error("Buffer too large without BodyLength after '8=FIX'. Discarding buffer segment.")
-                        self.incoming_buffer = self.incoming_buffer[self.incoming_buffer.find(b"8=FIX", 1):] if b"8=FIX" in self.incoming_buffer[1:] else b""
+                    logger.debug("Found '8=FIX' but no '9=' (BodyLength) yet. Buffer might be incomplete.")
+                    if buffer_len - pos > 4096: 
+                        logger.error("Buffer too large without BodyLength after '8=FIX'. Discarding buffer segment.")
+                        next_begin_string_index = find(BEGIN_STRING_PREFIX, pos + 1)
+                        pos = next_begin_string_index if next_begin_string_index != -1 else buffer_len
                     break 
 
-                body_length_value_start = body_length_tag_index + len(soh + b"9=")
-                body_length_value_end = self.incoming_buffer.find(soh, body_length_value_start)
+                body_length_value_start = body_length_tag_index + len(BODY_LENGTH_TAG)
+                body_length_value_end = find(SOH, body_length_value_start)
                 if body_length_value_end == -1:
-                    self.logger.debug("Found '9=' but no SOH after its value. Buffer might be incomplete.")
-                    if len(self.incoming_buffer) > 4096:
-                        self.logger.error("Buffer too large without SOH after BodyLength value. Discarding.")
-                        self.incoming_buffer = b""
+                    logger.debug("Found '9=' but no SOH after its value. Buffer might be incomplete.")
+                    if buffer_len - pos > 4096:
+                        logger.error("Buffer too large without SOH after BodyLength value. Discarding.")
+                        pos = buffer_len
                     break
                 
-                body_length_str = self.incoming_buffer[body_length_value_start:body_length_value_end]
+                body_length_str = buffer[body_length_value_start:body_length_value_end]
                 if not body_length_str.isdigit():
-                    self.logger.error(f"Invalid BodyLength value: '{body_length_str.decode(errors='replace')}'. Discarding buffer and attempting resync.")
-                    self.incoming_buffer = self.incoming_buffer[body_length_value_end:]
+                    logger.error("Invalid BodyLength value: '%s'. Discarding buffer and attempting resync.", body_length_str.decode(errors='replace'))
+                    pos = body_length_value_end
                     continue 
                 body_length = int(body_length_str)
 
@@ -389,51 +484,82 @@ class FixEngine:
                 
                 message_end_index = body_starts_after_bodylength_field_soh + body_length + checksum_field_len
                                 
-                if len(self.incoming_buffer) < message_end_index:
-                    self.logger.debug(f"Buffer has {len(self.incoming_buffer)} bytes, need {message_end_index} for full message (BodyLength {body_length}). Waiting for more data.")
+                if buffer_len < message_end_index:
+                    logger.debug("Buffer has %s bytes, need %s for full message (BodyLength %s). Waiting for more data.", buffer_len - pos, message_end_index - pos, body_length)
                     break 
 
-                full_fix_message_bytes = self.incoming_buffer[:message_end_index]
+                full_fix_message_bytes = buffer[pos:message_end_index]
                 
-                if not full_fix_message_bytes.endswith(soh):
-                    self.logger.error(f"Framed message does not end with SOH. Likely framing error or malformed message. Discarding: {full_fix_message_bytes.decode(errors='replace')[:100]}")
-                    next_begin_string_index = self.incoming_buffer.find(b"8=FIX", 1)
-                    if next_begin_string_index != -1:
-                        self.incoming_buffer = self.incoming_buffer[next_begin_string_index:]
-                    else:
-                        self.incoming_buffer = b""
+                if not full_fix_message_bytes.endswith(SOH):
+                    logger.error("Framed message does not end with SOH. Likely framing error or malformed message. Discarding: %s", full_fix_message_bytes.decode(errors='replace')[:100])
+                    next_begin_string_index = find(BEGIN_STRING_PREFIX, pos + 1)
+                    pos = next_begin_string_index if next_begin_string_index != -1 else buffer_len
                     continue
 
-                await self.process_single_fix_message(full_fix_message_bytes)
-                self.incoming_buffer = self.incoming_buffer[message_end_index:]
-                if self.incoming_buffer:
-                    self.logger.debug(f"Processed one message. Remaining in buffer: {len(self.incoming_buffer)} bytes.")
-                else:
-                    self.logger.debug("Processed one message. Buffer is now empty.")
+                checksum_start = len(full_fix_message_bytes) - checksum_field_len
+                received_checksum = full_fix_message_bytes[checksum_start + 3:-1]
+                pos = message_end_index
+                if (full_fix_message_bytes[checksum_start - 1:checksum_start + 3] != CHECKSUM_TAG
+                        or not received_checksum.isdigit()
+                        or int(received_checksum) != fix_checksum(full_fix_message_bytes, checksum_start)):
+                    # Garbled messages are ignored without consuming a sequence number
+                    logger.error("CheckSum mismatch. Discarding: %s", full_fix_message_bytes.decode(errors='replace')[:100])
+                    continue
+
+                await process_message(full_fix_message_bytes)
+                if queued:
+                    await self.drain_queued_messages()
+                if self.incoming_buffer is not buffer:
+                    # The session was reset while the message was being processed
+                    return
+                if debug_enabled:
+                    logger.debug("Processed one message. Remaining in buffer: %s bytes.", buffer_len - pos)
 
             except Exception as e_frame:
-                self.logger.error(f"Error during message framing: {e_frame}", exc_info=True)
-                self.incoming_buffer = b"" 
+                logger.error("Error during message framing: %s", e_frame, exc_info=True)
+                pos = buffer_len
                 break
 
+        if self.incoming_buffer is buffer:
+            self.incoming_buffer = buffer[pos:] if pos else buffer
+
     async def process_single_fix_message(self, message_bytes: bytes) -> None:
-        full_fix_string = message_bytes.decode(errors='replace')
-        self.logger.debug(f"Attempting to parse full_fix_string: '{full_fix_string}'")
+        # Messages that only get dropped or queued at the sequence check never need a full parse
+        fast_msg_type, fast_seq_num, fast_poss_dup = extract_sequence_fields(message_bytes)
+        if fast_seq_num is not None and fast_msg_type not in ('A', '4'):
+            # Reading the counter is a plain attribute read with no await in between, so the
+            # in-sequence and duplicate cases need no lock; only the gap path, which awaits, takes it.
+            expected_seq_num = self.message_store.get_next_incoming_sequence_number()
+            if fast_seq_num < expected_seq_num and fast_poss_dup:
+                self.logger.info("PossDup %s (Seq %s) rcvd for %s (expected %s). Ignoring duplicate.", fast_msg_type, fast_seq_num, self.session_id, expected_seq_num)
+                return
+            if fast_seq_num > expected_seq_num:
+                async with self.lock:
+                    expected_seq_num = self.message_store.get_next_incoming_sequence_number()
+                    if fast_seq_num > expected_seq_num:
+                        await self.handle_sequence_gap(fast_seq_num, expected_seq_num, message_bytes)
+                        return
+
+        # The codec parses bytes directly and the store keeps the raw frame; text is only built for logging
         parsed_message = None
         try:
             msg_obj = self.fixmsg({})
-            msg_obj.from_wire(full_fix_string, codec=self.codec)
+            msg_obj.from_wire(message_bytes, codec=self.codec)
             parsed_message = msg_obj
         except Exception as e:
-            self.logger.error(f"PARSE ERROR ({self.session_id}): '{full_fix_string[:150]}...' Error: {e}", exc_info=True)
+            self.logger.error("PARSE ERROR (%s): '%s...' Error: %s", self.session_id, message_bytes[:150].decode(errors='replace'), e, exc_info=True)
             return
 
         if parsed_message is None:
-            self.logger.error(f"PARSING FAILED for full_fix_string: '{full_fix_string}'. from_wire returned None.")
+            self.logger.error("PARSING FAILED for message: '%s'. from_wire returned None.", message_bytes.decode(errors='replace'))
             return
 
+        msg_type = parsed_message.get(35)
+        if msg_type is not None:
+            # Interned so handler dispatch and the admin-type checks below hash/compare by identity
+            msg_type = parsed_message[35] = sys.intern(msg_type)
+
         async with self.lock:
-            msg_type = parsed_message.get(35)
             received_seq_num_str = parsed_message.get(34)
             if not received_seq_num_str or not received_seq_num_str.isdigit():
                 reason = f"Invalid or missing MsgSeqNum (34) in msg from {parsed_message.get(49, 'UNKNOWN')}: '{received_seq_num_str}'"
@@ -450,10 +576,10 @@ class FixEngine:
                 if new_seq_no and new_seq_no.isdigit():
                     new_seq_no = int(new_seq_no)
                     if new_seq_no > expected_seq_num:
-                        self.logger.info(f"Processing SequenceReset-GapFill. Setting next expected incoming to {new_seq_no}.")
+                        self.logger.info("Processing SequenceReset-GapFill. Setting next expected incoming to %s.", new_seq_no)
                         await self.message_store.set_incoming_sequence_number(new_seq_no)
                     else:
-                        self.logger.info(f"Ignoring duplicate or out-of-order SequenceReset-GapFill with NewSeqNo={new_seq_no}.")
+                        self.logger.info("Ignoring duplicate or out-of-order SequenceReset-GapFill with NewSeqNo=%s.", new_seq_no)
                 return
 
             if msg_type == 'A' and parsed_message.get(141) == 'Y':
@@ -465,21 +591,16 @@ class FixEngine:
             if received_seq_num < expected_seq_num:
                 poss_dup_flag = parsed_message.get(43)
                 if poss_dup_flag == 'Y':
-                    self.logger.info(f"PossDup {msg_type} (Seq {received_seq_num}) rcvd for {self.session_id} (expected {expected_seq_num}). App layer should handle.")
+                    # Already stored and sequenced; storing it again would overwrite the row and advance the seqnum
+                    self.logger.info("PossDup %s (Seq %s) rcvd for %s (expected %s). Ignoring duplicate.", msg_type, received_seq_num, self.session_id, expected_seq_num)
+                    return
                 else:
                     text = f"MsgSeqNum too low, expected {expected_seq_num} but received {received_seq_num}"
-                    self.logger.error(f"{text} for {self.session_id}. Not PossDup. Sending Logout.")
+                    self.logger.error("%s for %s. Not PossDup. Sending Logout.", text, self.session_id)
                     await self.send_logout_message(text=text)
                     return
             elif received_seq_num > expected_seq_num:
-                if not self.resend_request_outstanding or self.resend_request_expected_seq != expected_seq_num:
-                    self.logger.warning(f"MsgSeqNum TOO HIGH (Gap) for {self.session_id}. Expected: {expected_seq_num}, Rcvd: {received_seq_num}. Sending Resend Request.")
-                    resend_req = self.fixmsg({35: '2', 7: expected_seq_num, 16: 0})
-                    await self.send_message(resend_req)
-                    self.resend_request_outstanding = True
-                    self.resend_request_expected_seq = expected_seq_num
-                else:
-                    self.logger.debug(f"ResendRequest already outstanding for expected_seq_num={expected_seq_num}, not sending another.")
+                await self.handle_sequence_gap(received_seq_num, expected_seq_num, message_bytes)
                 return
 
             if self.resend_request_outstanding and received_seq_num == expected_seq_num:
@@ -490,17 +611,45 @@ class FixEngine:
             await self.message_store.store_message(
                 self.version, parsed_message.get(49), parsed_message.get(56),
                 received_seq_num,
-                full_fix_string
+                message_bytes
             )
 
             if msg_type not in ['A', '5', '4']:
-                if hasattr(self.message_store, 'increment_incoming_sequence_number'):
-                    await self.message_store.increment_incoming_sequence_number()
-                else:
-                    await self.message_store.set_incoming_sequence_number(received_seq_num + 1)
+                await self.message_store.increment_incoming_sequence_number()
 
             await self.message_processor.process_message(parsed_message)
 
+    async def handle_sequence_gap(self, received_seq_num: int, expected_seq_num: int, message_bytes: bytes) -> None:
+        queued = self.queued_while_resend
+        if len(queued) < queued.maxlen:
+            queued.append((received_seq_num, message_bytes))
+        else:
+            # Appending would evict the lowest queued seqnum, the first one the drain needs; drop this one
+            # instead and let the gap it leaves be re-requested once the queue has drained
+            self.logger.warning("Resend queue full (%s messages) for %s; not queueing Seq %s.", queued.maxlen, self.session_id, received_seq_num)
+        if not self.resend_request_outstanding or self.resend_request_expected_seq != expected_seq_num:
+            self.logger.warning("MsgSeqNum TOO HIGH (Gap) for %s. Expected: %s, Rcvd: %s. Sending Resend Request.", self.session_id, expected_seq_num, received_seq_num)
+            await self.send_resend_request(expected_seq_num)
+            self.resend_request_outstanding = True
+            self.resend_request_expected_seq = expected_seq_num
+        else:
+            self.logger.debug("ResendRequest already outstanding for expected_seq_num=%s, not sending another.", expected_seq_num)
+
+    async def drain_queued_messages(self) -> None:
+        while self.queued_while_resend:
+            queued_seq_num, queued_bytes = self.queued_while_resend[0]
+            expected_seq_num = self.message_store.get_next_incoming_sequence_number()
+            if queued_seq_num > expected_seq_num:
+                break
+            self.queued_while_resend.popleft()
+            if queued_seq_num == expected_seq_num:
+                self.logger.debug("Replaying queued message Seq %s after gap fill.", queued_seq_num)
+                await self.process_single_fix_message(queued_bytes)
+
+    async def send_resend_request(self, begin_seq_num: int, end_seq_num: int = 0):
+        # Built in one go: 34 and 52 are filled in by send_message, only 7/16 vary per gap
+        await self.send_message(self.fixmsg({35: '2', 7: begin_seq_num, 16: end_seq_num}))
+
     async def send_reject_message(
         self,
         ref_seq_num: int,
@@ -521,7 +670,7 @@ class FixEngine:
     async def disconnect(self, graceful: bool = True) -> None:
         current_state_name = self.state_machine.state.name
         self.logger.info(f"Disconnect requested for {self.session_id}. Graceful: {graceful}. Current state: {current_state_name}.")
-        self.incoming_buffer = b"" 
+        self._reset_session_state()
 
         if current_state_name == "DISCONNECTED" and (not self.network or not self.network.running):
             self.logger.info(f"Session {self.session_id} already disconnected and network not running.")
@@ -620,11 +769,11 @@ class FixEngine:
             self.logger.warning(f"Cannot request logoff: session state is {self.state_machine.state.name}")
             return
 
-        self._logoff_future = asyncio.get_event_loop().create_future()
+        self._logoff_event.clear()
         await self.send_logout_message("Operator requested logout")
 
         try:
-            await asyncio.wait_for(self._logoff_future, timeout=timeout)
+            await asyncio.wait_for(self._logoff_event.wait(), timeout=timeout)
             self.logger.info(f"Logoff response received for {self.session_id}. Proceeding to disconnect.")
         except asyncio.TimeoutError:
             self.logger.warning(f"Timeout waiting for Logoff response for {self.session_id}. Forcing disconnect.")
@@ -632,9 +781,9 @@ class FixEngine:
         await self.disconnect(graceful=False)
 
     def notify_logoff_received(self) -> None:
-        if hasattr(self, "_logoff_future") and self._logoff_future and not self._logoff_future.done():
-            self._logoff_future.set_result(True)
-            self.logger.debug(f"notify_logoff_received: Logoff future set for {self.session_id}")
+        if not self._logoff_event.is_set():
+            self._logoff_event.set()
+            self.logger.debug(f"notify_logoff_received: Logoff event set for {self.session_id}")
 
     @classmethod
     async def create(
@@ -647,7 +796,7 @@ class FixEngine:
         self = cls(config_manager, application, initial_incoming_seqnum, initial_outgoing_seqnum)
         db_path = self.config_manager.get('FIX', 'state_file', 'fix_state.db')
         store_type = self.config_manager.get_message_store_type('database')
-        self.logger.info(f"Using message store type: {store_type}")
+        self.logger.info("Using message store type: %s", store_type)
         self.message_store = await MessageStoreFactory.get_message_store(
             store_type,
             db_path,
@@ -16,6 +16,9 @@ class Heartbeat:
         self.last_received_time = 0
         self.missed_heartbeats = 0
         self.test_request_id = None # Store the ID of the last sent TestRequest
+        # Set while the session is ACTIVE so the paused loop wakes on the transition instead of polling
+        self._active_event = asyncio.Event()
+        self.state_machine.subscribe(self._on_state_change)
 
         # Instantiate TestRequest correctly, passing the engine's fixmsg method
         if self.fix_engine and hasattr(self.fix_engine, 'fixmsg'):
@@ -58,6 +61,12 @@ class Heartbeat:
                 self.test_request_task = None
         self.logger.info("Heartbeat mechanism stopped.")
 
+    def _on_state_change(self, state_name):
+        if state_name == 'ACTIVE':
+            self._active_event.set()
+        else:
+            self._active_event.clear()
+
     def is_running(self):
         return self.heartbeat_task is not None and not self.heartbeat_task.done()
 
@@ -66,7 +75,12 @@ class Heartbeat:
             while True:
                 if self.state_machine.state.name != 'ACTIVE':
                     self.logger.debug("Session not ACTIVE. Heartbeat logic paused.")
-                    await asyncio.sleep(self.interval / 2) # Check state more frequently when not active
+                    self._active_event.clear()
+                    try:
+                        # Wake as soon as the session turns ACTIVE; the timeout keeps the old worst case
+                        await asyncio.wait_for(self._active_event.wait(), timeout=self.interval / 2)
+                    except asyncio.TimeoutError:
+                        pass
                     continue
 
                 now = asyncio.get_event_loop().time()
@@ -104,7 +118,12 @@ class Heartbeat:
                     else:
                         self.logger.error("Cannot send TestRequest: test_request_sender not initialized.")
                 
-                await asyncio.sleep(1)  # Check every second
+                # Sleep until the nearest deadline instead of waking every second; incoming
+                # traffic only pushes these deadlines later, so waking early is the only risk
+                next_deadline = min(self.last_sent_time + self.interval, self.last_received_time + timeout_threshold)
+                if not self.test_request_id:
+                    next_deadline = min(next_deadline, self.last_received_time + test_request_threshold)
+                await asyncio.sleep(max(next_deadline - asyncio.get_event_loop().time(), 0.01))
         except asyncio.CancelledError:
             self.logger.info("Heartbeat logic task was cancelled.")
         except Exception as e:
@@ -9,15 +9,17 @@ def logging_decorator(handler_func: Callable[..., Awaitable[Any]]) -> Callable[.
         msg_type_for_log = message.get(35, "UNKNOWN_TYPE")
         seq_num_for_log = message.get(34, "NO_SEQ")
         if hasattr(self, 'logger') and self.logger:
-            log_message_str = message.to_wire(self.engine.codec) if hasattr(self.engine, 'codec') and hasattr(message, 'to_wire') else str(message)
-            self.logger.debug(f"Handling {msg_type_for_log} (Seq {seq_num_for_log}). Incoming: {log_message_str}")
+            # Re-serialising the message is only worth it when the line will actually be emitted
+            if self.logger.isEnabledFor(logging.DEBUG):
+                log_message_str = message.to_wire(self.engine.codec) if hasattr(self.engine, 'codec') and hasattr(message, 'to_wire') else str(message)
+                self.logger.debug("Handling %s (Seq %s). Incoming: %s", msg_type_for_log, seq_num_for_log, log_message_str)
         else:
             print(f"Fallback Logging: Handling message before {msg_type_for_log} (Seq {seq_num_for_log})")
         
         result = await handler_func(self, message)
         
         if hasattr(self, 'logger') and self.logger:
-            self.logger.debug(f"Finished handling {msg_type_for_log} (Seq {seq_num_for_log}).")
+            self.logger.debug("Finished handling %s (Seq %s).", msg_type_for_log, seq_num_for_log)
         else:
             print(f"Fallback Logging: Finished handling message {msg_type_for_log} (Seq {seq_num_for_log})")
         return result
@@ -118,7 +120,7 @@ class LogonHandler(MessageHandler):
                 return
 
             expected_incoming_seq_num = self.message_store.get_next_incoming_sequence_number()
-            our_logon_had_reset = self.engine.config_manager.get('FIX', 'reset_seq_num_on_logon', 'false').lower() == 'true'
+            our_logon_had_reset = self.engine.reset_seq_num_on_logon
 
             if our_logon_had_reset and reset_seq_num_flag and received_seq_num == 1:
                 # Accept Logon response with MsgSeqNum=1 if we sent ResetSeqNumFlag=Y
@@ -222,7 +224,7 @@ class ResendRequestHandler(MessageHandler):
         start_seq_num = int(start_seq_num_str)
         end_seq_num = int(end_seq_num_str)
         
-        self.logger.info(f"Received Resend Request: BeginSeqNo={start_seq_num}, EndSeqNo={end_seq_num}.")
+        self.logger.info("Received Resend Request: BeginSeqNo=%s, EndSeqNo=%s.", start_seq_num, end_seq_num)
 
         if end_seq_num != 0 and end_seq_num < start_seq_num:
             reason = f"Invalid range in ResendRequest: EndSeqNo({end_seq_num}) < BeginSeqNo({start_seq_num})"
@@ -236,47 +238,55 @@ class ResendRequestHandler(MessageHandler):
         if end_seq_num == 0:
             current_outgoing = self.message_store.get_current_outgoing_sequence_number() 
             effective_end_seq_num = current_outgoing
-            self.logger.info(f"EndSeqNo=0, adjusted to current last sent: {effective_end_seq_num}.")
+            self.logger.info("EndSeqNo=0, adjusted to current last sent: %s.", effective_end_seq_num)
             if effective_end_seq_num < start_seq_num and start_seq_num > 0 :
-                 self.logger.info(f"Adjusted EndSeqNo ({effective_end_seq_num}) is less than BeginSeqNo ({start_seq_num}). Nothing to resend.")
-                 self.logger.info(f"Completed processing Resend Request from {start_seq_num} to {end_seq_num} (effective {effective_end_seq_num}). Nothing to resend.")
+                 self.logger.info("Adjusted EndSeqNo (%s) is less than BeginSeqNo (%s). Nothing to resend.", effective_end_seq_num, start_seq_num)
+                 self.logger.info("Completed processing Resend Request from %s to %s (effective %s). Nothing to resend.", start_seq_num, end_seq_num, effective_end_seq_num)
                  return
 
+        # One range query for the whole request instead of a store round trip per MsgSeqNum
+        stored_messages = await self.message_store.get_messages_range(
+            self.engine.version, self.engine.sender, self.engine.target, start_seq_num, effective_end_seq_num
+        )
+        # Consecutive messages that cannot be resent are covered by one GapFill rather than one each
+        gap_start = None
         for seq_num_to_resend in range(start_seq_num, effective_end_seq_num + 1):
-            stored_message_str = await self.message_store.get_message(
-                self.engine.version,
-                self.engine.sender, 
-                self.engine.target, 
-                seq_num_to_resend
-            )
+            stored_message = stored_messages.get(seq_num_to_resend)
 
-            if stored_message_str:
-                self.logger.info(f"Resending stored message for SeqNum {seq_num_to_resend}.")
+            if stored_message:
+                self.logger.info("Resending stored message for SeqNum %s.", seq_num_to_resend)
                 try:
-                    resent_msg = self.engine.fixmsg({}).from_wire(stored_message_str, codec=self.engine.codec)
+                    resent_msg = self.engine.fixmsg({})
+                    resent_msg.from_wire(stored_message, codec=self.engine.codec)
                     resent_msg[43] = 'Y' 
                     original_sending_time = resent_msg.get(52) 
                     if original_sending_time:
                         resent_msg[122] = original_sending_time
-                    await self.engine.send_message(resent_msg)
+                    if gap_start is not None:
+                        await self.send_gap_fill(gap_start, seq_num_to_resend - 1)
+                        gap_start = None
+                    await self.engine.send_message(resent_msg, override_seqnum=seq_num_to_resend)
+                    continue
                 except Exception as e:
-                    self.logger.error(f"Error parsing or preparing stored message {seq_num_to_resend} for resend: {e}. Sending GapFill.", exc_info=True)
-                    await self.send_gap_fill(seq_num_to_resend, seq_num_to_resend)
+                    self.logger.error("Error parsing or preparing stored message %s for resend: %s. Sending GapFill.", seq_num_to_resend, e, exc_info=True)
             else:
-                self.logger.warning(f"Message for SeqNum {seq_num_to_resend} not found in store. Sending GapFill.")
-                await self.send_gap_fill(seq_num_to_resend, seq_num_to_resend)
-                # Always call application callback
+                self.logger.warning("Message for SeqNum %s not found in store. Sending GapFill.", seq_num_to_resend)
+            if gap_start is None:
+                gap_start = seq_num_to_resend
+        if gap_start is not None:
+            await self.send_gap_fill(gap_start, effective_end_seq_num)
 
+        # Always call application callback
         if hasattr(self.application, "fromAdmin"):
             await self.application.fromAdmin(message, self.engine.session_id)
-        self.logger.info(f"Completed processing Resend Request from {start_seq_num} to {end_seq_num} (effective {effective_end_seq_num}).")
+        self.logger.info("Completed processing Resend Request from %s to %s (effective %s).", start_seq_num, end_seq_num, effective_end_seq_num)
 
     async def send_gap_fill(self, begin_gap_seq_num: int, end_gap_seq_num: int) -> None:
         next_seq_no_after_gap = end_gap_seq_num + 1
-        self.logger.info(f"Sending SequenceReset-GapFill for range {begin_gap_seq_num}-{end_gap_seq_num}. NewSeqNo will be {next_seq_no_after_gap}.")
-        gap_fill_msg = self.engine.fixmsg({})
-        gap_fill_msg.update({ 35: '4', 36: next_seq_no_after_gap, 123: 'Y' })
-        await self.engine.send_message(gap_fill_msg)
+        self.logger.info("Sending SequenceReset-GapFill for range %s-%s. NewSeqNo will be %s.", begin_gap_seq_num, end_gap_seq_num, next_seq_no_after_gap)
+        gap_fill_msg = self.engine.fixmsg({35: '4', 36: next_seq_no_after_gap, 123: 'Y'})
+        # A GapFill carries the first skipped MsgSeqNum rather than consuming a new one
+        await self.engine.send_message(gap_fill_msg, override_seqnum=begin_gap_seq_num)
 
 
 class SequenceResetHandler(MessageHandler):
@@ -374,7 +384,7 @@ class HeartbeatHandler(MessageHandler):
     @logging_decorator
     async def handle(self, message: Any) -> None:
         test_req_id_in_hb = message.get(112) 
-        self.logger.debug(f"Received Heartbeat. TestReqID (112) in Heartbeat: {test_req_id_in_hb}")
+        self.logger.debug("Received Heartbeat. TestReqID (112) in Heartbeat: %s", test_req_id_in_hb)
         
         if self.engine.heartbeat:
             self.engine.heartbeat.process_incoming_heartbeat(test_req_id_in_hb)
@@ -1,5 +1,4 @@
 from pyfixmsg_plus.fixengine.database_message_store import DatabaseMessageStore
-from pyfixmsg_plus.fixengine.database_message_store_aiosqlite import DatabaseMessageStoreAioSqlite
 from typing import Optional, Any
 
 try:
@@ -7,6 +6,12 @@ try:
 except ImportError:
     DatabaseMessageStoreAioSqlite = None
 
+# store_type -> store class; a single dict probe instead of an if/elif chain of string compares
+STORE_TYPES = {
+    'database': DatabaseMessageStore,
+    'aiosqlite': DatabaseMessageStoreAioSqlite,
+}
+
 class MessageStoreFactory:
     @staticmethod
     async def get_message_store(
@@ -16,15 +21,11 @@ class MessageStoreFactory:
         sendercompid: Optional[str] = None,
         targetcompid: Optional[str] = None
     ) -> Any:
-        if store_type == 'database':
-            store = DatabaseMessageStore(db_path, beginstring, sendercompid, targetcompid)
-            await store.initialize()
-            return store
-        elif store_type == 'aiosqlite':
-            if DatabaseMessageStoreAioSqlite is None:
-                raise ImportError("The 'aiosqlite' store type requires the aiosqlite library, which is not installed.")
-            store = DatabaseMessageStoreAioSqlite(db_path, beginstring, sendercompid, targetcompid)
-            await store.initialize()
-            return store
-        else:
+        if store_type not in STORE_TYPES:
             raise ValueError(f"Unknown store type: {store_type}")
+        store_cls = STORE_TYPES[store_type]
+        if store_cls is None:
+            raise ImportError(f"The '{store_type}' store type requires the {store_type} library, which is not installed.")
+        store = store_cls(db_path, beginstring, sendercompid, targetcompid)
+        await store.initialize()
+        return store
@@ -6,7 +6,7 @@ from abc import ABC, abstractmethod
 class NetworkConnection(ABC):
     def __init__(self, host, port, use_tls=False, certfile=None, keyfile=None):
         self.host = host
-        self.port = port
+        self.port = int(port)  # settled once here; connect/listen use it as-is
         self.use_tls = use_tls
         self.certfile = certfile
         self.keyfile = keyfile
@@ -77,16 +77,18 @@ class NetworkConnection(ABC):
             return
 
         self.logger.info("Receive loop started.")
+        reader = self.reader
+        read_size = self.buffer_size
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
         try:
             while self.running:
-                if self.reader.at_eof():
+                if reader.at_eof():
                     self.logger.info("EOF received, connection closed by peer.")
                     break
-                data = await self.reader.read(self.buffer_size)
-                
-                # ****** Added diagnostic logging ******
-                self.logger.debug(f"{self.__class__.__name__} network layer read {len(data)} bytes: {data[:100]}") # Log first 100 bytes
-                # *************************************
+                data = await reader.read(read_size)
+
+                if debug_enabled:
+                    self.logger.debug("%s network layer read %s bytes: %r", self.__class__.__name__, len(data), data[:100])
 
                 if not data:
                     self.logger.info("Connection closed by peer (EOF received, read returned no data).")
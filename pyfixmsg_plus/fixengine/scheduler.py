@@ -1,15 +1,19 @@
 import asyncio
 import json
+import logging
 from datetime import datetime, timedelta
 from pyfixmsg_plus.fixengine.configmanager import ConfigManager
 
+logger = logging.getLogger(__name__)
+
 class Scheduler:
     def __init__(self, config_manager, fix_engine):
         self.config_manager = config_manager
         self.fix_engine = fix_engine
         self.schedules = []
         self.load_configuration()
-        self.scheduler_task = asyncio.create_task(self.run_scheduler())
+        # FixEngine.start() owns the run_scheduler() task; starting one here as well ran every action twice
+        self.scheduler_task = None
 
     def load_configuration(self):
         # Load the schedules from the config manager
@@ -30,15 +34,37 @@ class Scheduler:
         await self.start()
 
     async def run_scheduler(self):
+        # Sleep until the next task is due instead of waking every minute to poll the list
+        timed_tasks = []
+        for task in self.schedules:
+            try:
+                timed_tasks.append((datetime.strptime(task["time"], "%H:%M").time(), task))
+            except Exception as e:
+                logger.error("Error processing task %s: %s", task, e)
+        if not timed_tasks:
+            return
+
+        # Run times up to and including `handled` have been dealt with; a task whose time passed
+        # less than a minute ago still fires on startup, as with the old per-minute poll.
+        handled = datetime.now() - timedelta(minutes=1)
         while True:
-            now = datetime.now()
-            for task in self.schedules:
+            upcoming = []
+            for task_time, task in timed_tasks:
+                run_at = datetime.combine(handled.date(), task_time)
+                if run_at <= handled:
+                    run_at += timedelta(days=1)
+                upcoming.append((run_at, task))
+            next_run = min(run_at for run_at, _ in upcoming)
+            delay = (next_run - datetime.now()).total_seconds()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            for run_at, task in upcoming:
+                if run_at != next_run:
+                    continue
                 try:
-                    task_time = datetime.combine(now.date(), datetime.strptime(task["time"], "%H:%M").time())
-                    if now >= task_time and (now - task_time) < timedelta(minutes=1):
-                        action = getattr(self, task["action"], None)
-                        if action:
-                            await action()
+                    action = getattr(self, task["action"], None)
+                    if action:
+                        await action()
                 except Exception as e:
-                    print(f"Error processing task {task}: {e}")
-            await asyncio.sleep(60)
+                    logger.error("Error processing task %s: %s", task, e)
+            handled = next_run
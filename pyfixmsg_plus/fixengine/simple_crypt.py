@@ -33,6 +33,8 @@ class SimpleCrypt:
         self.event_notifier = event_notifier
         self.logger = logger
         self.iterations = iterations
+        # PBKDF2 output per (password, salt); the same stored values are decrypted repeatedly
+        self._key_cache = {}
 
     def log_message(self, msg: str, level: str) -> None:
         if self.event_notifier:
@@ -59,7 +61,14 @@ class SimpleCrypt:
             return self.decrypt(crypt_password, param)
 
     def derive_key(self, password: bytes, salt: bytes) -> bytes:
-        return hashlib.pbkdf2_hmac('sha256', password, salt, self.iterations, dklen=32)
+        cache_key = (password, salt)
+        key = self._key_cache.get(cache_key)
+        if key is None:
+            if len(self._key_cache) >= 64:
+                self._key_cache.clear()
+            key = hashlib.pbkdf2_hmac('sha256', password, salt, self.iterations, dklen=32)
+            self._key_cache[cache_key] = key
+        return key
 
     def stream_cipher(self, key: bytes, data: bytes) -> bytes:
         # Hash-based keystream (not secure, but better than plain XOR)
@@ -5,6 +5,9 @@ class TestRequest:
         self.send_message = send_message_callback
         self.config_manager = config_manager
         self.fix_message_creator = fix_message_creator # Store the creator
+        # CompIDs are fixed for the session; read them once instead of on every TestRequest
+        self.sender = config_manager.get('FIX', 'sender', 'SENDER')
+        self.target = config_manager.get('FIX', 'target', 'TARGET')
 
     async def send_test_request(self):
         # Use datetime.now(timezone.utc) instead of deprecated utcnow()
@@ -12,8 +15,8 @@ class TestRequest:
         
         fields = {
             35: '1',  # MsgType: TestRequest
-            49: self.config_manager.get('FIX', 'sender', 'SENDER'), # Use configured sender
-            56: self.config_manager.get('FIX', 'target', 'TARGET'), # Use configured target
+            49: self.sender, # Use configured sender
+            56: self.target, # Use configured target
             112: test_req_id  # TestReqID
         }
         # Use the provided fix_message_creator (engine.fixmsg)
@@ -20,5 +20,130 @@ def test_config_manager_load_config():
     config_manager.load_config()
     assert config_manager.get('FIX', 'sender_comp_id', 'SENDER') == 'SENDER'
 
+def test_config_file_cache_tracks_changes(tmp_path):
+    from pyfixmsg_plus.fixengine.configmanager import _read_config_file
+    path = tmp_path / 'cached.ini'
+    path.write_text("[FIX]\nsender = A\n")
+    first = _read_config_file(str(path))
+    assert _read_config_file(str(path)) is first
+    path.write_text("[FIX]\nsender = BB\n")
+    assert _read_config_file(str(path))['FIX']['sender'] == 'BB'
+    link = tmp_path / 'linked.ini'
+    link.symlink_to(path)
+    assert _read_config_file(str(link)) is _read_config_file(str(path))
+
+def test_toml_config_file(tmp_path):
+    from pyfixmsg_plus.fixengine.configmanager import get_config_manager
+    path = tmp_path / 'session.toml'
+    path.write_text('[FIX]\nsender = "A"\nport = 5001\nuse_tls = true\n')
+    cm = get_config_manager(str(path))
+    assert cm.get('FIX', 'sender') == 'A'
+    assert cm.get('FIX', 'port') == '5001'
+    assert cm.get('FIX', 'use_tls') == 'true'
+
+def test_decrypt_is_memoized(monkeypatch):
+    from pyfixmsg_plus.fixengine import configmanager
+    token = configmanager.encrypt('secret')
+    calls = []
+    real_derive = configmanager._simple_crypt.derive_key
+    monkeypatch.setattr(configmanager._simple_crypt, 'derive_key',
+                        lambda *a: calls.append(a) or real_derive(*a))
+    assert configmanager.decrypt(token) == 'secret'
+    assert configmanager.decrypt(token) == 'secret'
+    assert len(calls) == 1
+
+def test_get_serves_section_from_snapshot(monkeypatch):
+    from pyfixmsg_plus.fixengine.configmanager import get_config_manager
+    cm = get_config_manager('missing-snapshot.ini')
+    cm.config.read_string("[DEFAULT]\nd = 1\n[FIX]\nPort = 5000\nhost = h\n")
+    assert cm.get('FIX', 'port') == '5000'
+    monkeypatch.setattr(cm.config, 'get', lambda *a, **k: pytest.fail('configparser.get called'))
+    assert cm.get('FIX', 'HOST') == 'h'
+    assert cm.get('FIX', 'd') == '1'
+    assert cm.get('OTHER', 'd', 'fallback') == 'fallback'
+
+def test_get_caches_decrypted_value(monkeypatch):
+    from pyfixmsg_plus.fixengine import configmanager
+    cm = configmanager.get_config_manager('missing-decrypt-cache.ini')
+    cm.set('FIX', 'password', 'secret', encrypt_value=True)
+    calls = []
+    monkeypatch.setattr(configmanager, 'decrypt', lambda v: calls.append(v) or 'secret')
+    assert cm.get('FIX', 'password', decrypt_value=True) == 'secret'
+    assert cm.get('FIX', 'password', decrypt_value=True) == 'secret'
+    assert len(calls) == 1
+    cm.set('FIX', 'password', 'other', encrypt_value=True)
+    cm.get('FIX', 'password', decrypt_value=True)
+    assert len(calls) == 2
+
+def test_aesgcm_values_round_trip():
+    pytest.importorskip('cryptography')
+    from pyfixmsg_plus.fixengine import configmanager
+    token = configmanager.encrypt('secret', aead=True)
+    assert token.startswith('gcm:')
+    assert configmanager.decrypt(token) == 'secret'
+
+def test_encrypt_defaults_to_portable_simplecrypt(monkeypatch):
+    from pyfixmsg_plus.fixengine import configmanager
+    token = configmanager.encrypt('secret')
+    assert not token.startswith('gcm:')
+    monkeypatch.setattr(configmanager, '_aesgcm', None)  # a host without cryptography/pycryptodome
+    assert configmanager.decrypt(token) == 'secret'
+    with pytest.raises(configmanager.SimpleCryptException):
+        configmanager.encrypt('secret', aead=True)
+
+def test_pycryptodome_values_round_trip(monkeypatch):
+    pytest.importorskip('Crypto.Cipher.AES')
+    from pyfixmsg_plus.fixengine import configmanager
+    monkeypatch.setattr(configmanager, '_aesgcm', configmanager._PyCryptodomeAESGCM(configmanager._AESGCM_KEY))
+    token = configmanager.encrypt('secret', aead=True)
+    assert token.startswith('gcm:')
+    assert configmanager.decrypt(token) == 'secret'
+
+def test_instance_returns_singleton():
+    assert ConfigManager.instance() is ConfigManager()
+
+def test_config_flag():
+    from pyfixmsg_plus.fixengine.configmanager import config_flag
+    for value in ('true', 'True', ' TRUE ', 'Y', 'yes', '1'):
+        assert config_flag(value)
+    for value in ('false', 'N', '0', '', None):
+        assert not config_flag(value)
+
+def test_get_section():
+    cm = ConfigManager()
+    cm.set('SECTION_TEST', 'option', 'value')
+    assert cm.get_section('SECTION_TEST')['option'] == 'value'
+    assert 'option' not in cm.get_section('NO_SUCH_SECTION')
+    cm.delete('SECTION_TEST')
+
+def test_get_section_missing_ignores_defaults(tmp_path):
+    from pyfixmsg_plus.fixengine.configmanager import get_config_manager
+    path = tmp_path / 'defaults.ini'
+    path.write_text("[DEFAULT]\nbase = /tmp\nport = 6000\nstate_file = %(base)s/state.db\n[OTHER]\nname = x\n")
+    cm = get_config_manager(str(path))
+    assert cm.get_section('FIX') == {}
+    assert cm.get('FIX', 'port', '5000') == '5000'
+    assert cm.get_section('OTHER')['state_file'] == '/tmp/state.db'
+
+def test_get_config_manager_per_path(tmp_path):
+    from pyfixmsg_plus.fixengine.configmanager import get_config_manager
+    first, second = tmp_path / 'a.ini', tmp_path / 'b.ini'
+    first.write_text("[FIX]\nsender = A\n")
+    second.write_text("[FIX]\nsender = B\n")
+    assert get_config_manager(str(first)) is get_config_manager(str(first))
+    assert get_config_manager(str(first)).get('FIX', 'sender') == 'A'
+    assert get_config_manager(str(second)).get('FIX', 'sender') == 'B'
+
+def test_get_cache_sees_direct_parser_changes():
+    cm = ConfigManager()
+    assert cm.get('CACHE_TEST', 'option', 'fallback') == 'fallback'
+    cm.config.add_section('CACHE_TEST')
+    cm.config.set('CACHE_TEST', 'option', 'one')
+    assert cm.get('CACHE_TEST', 'option') == 'one'
+    cm.set('CACHE_TEST', 'option', 'two')
+    assert cm.get('CACHE_TEST', 'option') == 'two'
+    cm.config.remove_section('CACHE_TEST')
+    assert cm.get('CACHE_TEST', 'option', 'fallback') == 'fallback'
+
 if __name__ == "__main__":
     pytest.main()
@@ -376,6 +376,104 @@ class TestAsyncDatabaseMessageStore:
         await store.close()
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestAioSqliteMessageStoreWrites:
+    """Commit batching and session-row writes of the aiosqlite store."""
+
+    @staticmethod
+    def _read(db_path, sql):
+        reader = sqlite3.connect(db_path)
+        try:
+            return reader.execute(sql).fetchall()
+        finally:
+            reader.close()
+
+    async def test_message_commits_with_sequence_flush(self, tmp_path):
+        db_path = str(tmp_path / 'store.db')
+        store = DatabaseMessageStoreAioSqlite(db_path, 'FIX.4.4', 'SENDER', 'TARGET', seqnum_flush_interval=60)
+        await store.initialize()
+        await store.store_message('FIX.4.4', 'SENDER', 'TARGET', 1, 'msg1')
+        await store.increment_outgoing_sequence_number()
+        assert self._read(db_path, "SELECT COUNT(*) FROM messages") == [(0,)]
+
+        await store.flush_sequence_numbers()
+        assert self._read(db_path, "SELECT COUNT(*) FROM messages") == [(1,)]
+        assert self._read(db_path, "SELECT next_outgoing_seqnum FROM sessions") == [(2,)]
+        await store.close()
+
+    async def test_store_and_advance_commits_message_with_seqnum(self, tmp_path):
+        db_path = str(tmp_path / 'store.db')
+        store = DatabaseMessageStoreAioSqlite(db_path, 'FIX.4.4', 'SENDER', 'TARGET', seqnum_flush_interval=60,
+                                              commit_batch_size=2)
+        await store.initialize()
+        await store.store_and_advance(1, b'msg1')
+        assert store.get_next_outgoing_sequence_number() == 2
+        await store.store_and_advance(2, b'msg2')
+
+        assert self._read(db_path, "SELECT COUNT(*) FROM messages") == [(2,)]
+        assert self._read(db_path, "SELECT next_outgoing_seqnum FROM sessions") == [(3,)]
+        await store.close()
+
+    async def test_failed_store_keeps_batch_and_advances(self, tmp_path):
+        db_path = str(tmp_path / 'store.db')
+        store = DatabaseMessageStoreAioSqlite(db_path, 'FIX.4.4', 'SENDER', 'TARGET', seqnum_flush_interval=60)
+        await store.initialize()
+        await store.store_and_advance(1, b'msg1')
+        await store.store_and_advance(2, object())  # cannot be bound; the message was still sent
+        assert store.get_next_outgoing_sequence_number() == 3
+        await store.close()
+
+        assert self._read(db_path, "SELECT msgseqnum FROM messages") == [(1,)]
+        assert self._read(db_path, "SELECT next_outgoing_seqnum FROM sessions") == [(3,)]
+
+    async def test_store_messages_batch(self, tmp_path):
+        db_path = str(tmp_path / 'store.db')
+        store = DatabaseMessageStoreAioSqlite(db_path, 'FIX.4.4', 'SENDER', 'TARGET')
+        await store.initialize()
+        await store.store_messages(('FIX.4.4', 'SENDER', 'TARGET', seq, f'msg{seq}') for seq in range(1, 101))
+
+        assert self._read(db_path, "SELECT COUNT(*) FROM messages") == [(100,)]
+        messages = await store.get_messages_range('FIX.4.4', 'SENDER', 'TARGET', 98, 200)
+        assert messages == {98: 'msg98', 99: 'msg99', 100: 'msg100'}
+        await store.close()
+
+    async def test_failed_bulk_store_keeps_other_pending_rows(self, tmp_path):
+        db_path = str(tmp_path / 'store.db')
+        store = DatabaseMessageStoreAioSqlite(db_path, 'FIX.4.4', 'SENDER', 'TARGET', seqnum_flush_interval=60)
+        await store.initialize()
+        await store.store_message('FIX.4.4', 'SENDER', 'TARGET', 1, 'pending')
+        rows = [('FIX.4.4', 'TARGET', 'SENDER', seq, f'msg{seq}') for seq in range(1, 11)]
+        rows[5] = ('FIX.4.4', 'TARGET', 'SENDER', 6, object())  # cannot be bound, after five rows went in
+        await store.store_messages(rows)
+        await store.close()
+
+        assert self._read(db_path, "SELECT sendercompid, msgseqnum, message FROM messages") == [('SENDER', 1, 'pending')]
+
+    async def test_sequence_saves_update_row_and_reset_moves_creation_time(self, tmp_path):
+        db_path = str(tmp_path / 'store.db')
+        store = DatabaseMessageStoreAioSqlite(db_path, 'FIX.4.4', 'SENDER', 'TARGET')
+        await store.initialize()
+        await store.set_outgoing_sequence_number(5)
+        [(rowid, created)] = self._read(db_path, "SELECT rowid, creation_time FROM sessions")
+
+        await store.set_incoming_sequence_number(7)
+        assert self._read(db_path, "SELECT rowid, creation_time, next_incoming_seqnum, next_outgoing_seqnum FROM sessions") == [
+            (rowid, created, 7, 5)]
+
+        await store.reset_sequence_numbers()
+        [(reset_rowid, reset_created, next_in, next_out)] = self._read(
+            db_path, "SELECT rowid, creation_time, next_incoming_seqnum, next_outgoing_seqnum FROM sessions")
+        assert (reset_rowid, next_in, next_out) == (rowid, 1, 1)
+        assert reset_created > created
+        await store.close()
+
+        reopened = DatabaseMessageStoreAioSqlite(db_path, 'FIX.4.4', 'SENDER', 'TARGET')
+        await reopened.initialize()
+        assert await reopened.load_sequence_numbers() == (1, 1)
+        await reopened.close()
+
+
 @pytest.mark.unit
 class TestStateMachine:
     """Unit tests for StateMachine."""
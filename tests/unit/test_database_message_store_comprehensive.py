@@ -19,9 +19,19 @@ def temp_db_path():
     with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as tmp:
         db_path = tmp.name
     yield db_path
-    # Cleanup
-    if os.path.exists(db_path):
-        os.unlink(db_path)
+    # Cleanup (WAL mode leaves -wal/-shm files next to the database)
+    for path in (db_path, db_path + '-wal', db_path + '-shm'):
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def _query(db_path, sql, params=()):
+    """Read the database file through a separate connection, never the store's own."""
+    reader = sqlite3.connect(db_path)
+    try:
+        return reader.execute(sql, params).fetchall()
+    finally:
+        reader.close()
 
 
 @pytest.fixture
@@ -207,6 +217,17 @@ class TestDatabaseMessageStoreMessages:
         
         await store.close()
     
+    @pytest.mark.asyncio
+    async def test_get_messages_range(self, temp_db_path, mock_config_manager):
+        store = DatabaseMessageStore(temp_db_path, 'FIX.4.4', 'SENDER', 'TARGET')
+        await store.initialize()
+        for seq_num in (1, 2, 4, 5):
+            await store.store_message('FIX.4.4', 'SENDER', 'TARGET', seq_num, f'msg{seq_num}')
+        await store.store_message('FIX.4.4', 'TARGET', 'SENDER', 3, 'other session')
+
+        assert await store.get_messages_range('FIX.4.4', 'SENDER', 'TARGET', 2, 4) == {2: 'msg2', 4: 'msg4'}
+        await store.close()
+
     @pytest.mark.asyncio
     async def test_get_message_not_found(self, temp_db_path, mock_config_manager):
         """Test retrieving non-existent message."""
@@ -415,6 +436,242 @@ class TestDatabaseMessageStoreIntegration:
         
         await store2.close()
 
+    @pytest.mark.asyncio
+    async def test_increments_are_flushed_lazily(self, temp_db_path, mock_config_manager):
+        """Increments are coalesced in memory and written back on flush."""
+        store = DatabaseMessageStore(temp_db_path, 'FIX.4.4', 'SENDER', 'TARGET', seqnum_flush_interval=60)
+        await store.initialize()
+        for _ in range(3):
+            await store.increment_outgoing_sequence_number()
+        assert await store.load_sequence_numbers() == (1, 1)
+
+        await store.flush_sequence_numbers()
+        assert await store.load_sequence_numbers() == (1, 4)
+
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_second_initialize_keeps_unflushed_counters(self, temp_db_path, mock_config_manager):
+        store = DatabaseMessageStore(temp_db_path, 'FIX.4.4', 'SENDER', 'TARGET', seqnum_flush_interval=60)
+        await store.initialize()
+        await store.increment_incoming_sequence_number()
+        await store.initialize()
+        assert store.get_next_incoming_sequence_number() == 2
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_message_commits_with_sequence_flush(self, temp_db_path, mock_config_manager):
+        store = DatabaseMessageStore(temp_db_path, 'FIX.4.4', 'SENDER', 'TARGET', seqnum_flush_interval=60)
+        await store.initialize()
+        await store.store_message('FIX.4.4', 'SENDER', 'TARGET', 1, 'msg1')
+        await store.increment_outgoing_sequence_number()
+        reader = sqlite3.connect(temp_db_path)
+        assert reader.execute("SELECT COUNT(*) FROM messages").fetchone()[0] == 0
+
+        await store.flush_sequence_numbers()
+        assert reader.execute("SELECT COUNT(*) FROM messages").fetchone()[0] == 1
+        reader.close()
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_store_and_advance_commits_message_with_seqnum(self, temp_db_path, mock_config_manager):
+        store = DatabaseMessageStore(temp_db_path, 'FIX.4.4', 'SENDER', 'TARGET', seqnum_flush_interval=60,
+                                     commit_batch_size=2)
+        await store.initialize()
+        await store.store_and_advance(1, 'msg1')
+        assert store.get_next_outgoing_sequence_number() == 2
+        await store.store_and_advance(2, 'msg2')
+
+        reader = sqlite3.connect(temp_db_path)
+        assert reader.execute("SELECT COUNT(*) FROM messages").fetchone()[0] == 2
+        assert reader.execute("SELECT next_outgoing_seqnum FROM sessions").fetchone()[0] == 3
+        reader.close()
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_store_messages_batch(self, temp_db_path, mock_config_manager):
+        store = DatabaseMessageStore(temp_db_path, 'FIX.4.4', 'SENDER', 'TARGET')
+        await store.initialize()
+        await store.store_messages(('FIX.4.4', 'SENDER', 'TARGET', seq, f'msg{seq}') for seq in range(1, 501))
+
+        reader = sqlite3.connect(temp_db_path)
+        assert reader.execute("SELECT COUNT(*) FROM messages").fetchone()[0] == 500
+        reader.close()
+        assert await store.get_message('FIX.4.4', 'SENDER', 'TARGET', 500) == 'msg500'
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_get_message_sees_pending_batch(self, temp_db_path, mock_config_manager):
+        store = DatabaseMessageStore(temp_db_path, 'FIX.4.4', 'SENDER', 'TARGET', seqnum_flush_interval=60)
+        await store.initialize()
+        await store.store_message('FIX.4.4', 'SENDER', 'TARGET', 1, 'msg1')
+        assert _query(temp_db_path, "SELECT COUNT(*) FROM messages") == [(0,)]
+
+        # Lookups go to the read-only pool, which first publishes the open batch
+        assert await store.get_message('FIX.4.4', 'SENDER', 'TARGET', 1) == 'msg1'
+        assert await store.get_messages_range('FIX.4.4', 'SENDER', 'TARGET', 1, 5) == {1: 'msg1'}
+        assert _query(temp_db_path, "SELECT COUNT(*) FROM messages") == [(1,)]
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_reset_moves_creation_time_only(self, temp_db_path, mock_config_manager):
+        store = DatabaseMessageStore(temp_db_path, 'FIX.4.4', 'SENDER', 'TARGET')
+        await store.initialize()
+        await store.set_outgoing_sequence_number(5)
+        [(rowid, created)] = _query(temp_db_path, "SELECT rowid, creation_time FROM sessions")
+
+        await store.set_incoming_sequence_number(7)
+        assert _query(temp_db_path, "SELECT rowid, creation_time FROM sessions") == [(rowid, created)]
+        assert await store.load_sequence_numbers() == (7, 5)
+
+        await store.reset_sequence_numbers()
+        [(reset_rowid, next_in, next_out, reset_created)] = _query(
+            temp_db_path, "SELECT rowid, next_incoming_seqnum, next_outgoing_seqnum, creation_time FROM sessions")
+        assert (reset_rowid, next_in, next_out) == (rowid, 1, 1)
+        assert reset_created > created
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_wire_bytes_stored_as_blob(self, temp_db_path, mock_config_manager):
+        store = DatabaseMessageStore(temp_db_path, 'FIX.4.4', 'SENDER', 'TARGET')
+        await store.initialize()
+        wire = b'8=FIX.4.4\x019=5\x0135=0\x0110=161\x01'
+        await store.store_message('FIX.4.4', 'SENDER', 'TARGET', 1, wire)
+        assert await store.get_message('FIX.4.4', 'SENDER', 'TARGET', 1) == wire
+        assert _query(temp_db_path, "SELECT typeof(message) FROM messages") == [('blob',)]
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_lookups_search_primary_key(self, temp_db_path, mock_config_manager):
+        from pyfixmsg_plus.fixengine import database_message_store
+        store = DatabaseMessageStore(temp_db_path, 'FIX.4.4', 'SENDER', 'TARGET')  # creates the schema
+        for sql, params in ((database_message_store.SQL_GET_MESSAGE, ('FIX.4.4', 'SENDER', 'TARGET', 1)),
+                            (database_message_store.SQL_GET_MESSAGE_RANGE, ('FIX.4.4', 'SENDER', 'TARGET', 1, 9))):
+            plan = ' '.join(row[3] for row in _query(temp_db_path, 'EXPLAIN QUERY PLAN ' + sql, params))
+            assert 'SEARCH messages USING INDEX sqlite_autoindex_messages_1' in plan
+            assert 'TEMP B-TREE' not in plan
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_truncates_wal(self, temp_db_path, mock_config_manager):
+        store = DatabaseMessageStore(temp_db_path, 'FIX.4.4', 'SENDER', 'TARGET')
+        await store.initialize()
+        await store.store_message('FIX.4.4', 'SENDER', 'TARGET', 1, 'msg1')
+        await store.flush_sequence_numbers()
+        busy, wal_pages, checkpointed = await store.checkpoint()
+        assert busy == 0 and wal_pages == checkpointed
+
+        await store.checkpoint('TRUNCATE')
+        assert os.path.getsize(temp_db_path + '-wal') == 0
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_close_is_idempotent(self, temp_db_path, mock_config_manager):
+        store1 = DatabaseMessageStore(temp_db_path, 'FIX.4.4', 'SENDER', 'TARGET', seqnum_flush_interval=60)
+        store2 = DatabaseMessageStore(temp_db_path, 'FIX.4.4', 'TARGET', 'SENDER')
+        await store1.initialize()
+        await store1.store_and_advance(1, 'msg1')
+        await asyncio.gather(store1.close(), store1.close())
+        await store1.store_message('FIX.4.4', 'SENDER', 'TARGET', 2, 'late')
+
+        assert _query(temp_db_path, "SELECT next_outgoing_seqnum FROM sessions") == [(2,)]
+        assert _query(temp_db_path, "SELECT COUNT(*) FROM messages") == [(1,)]
+        await store2.close()
+
+    @pytest.mark.asyncio
+    async def test_stores_on_one_file_share_the_commit_batch(self, temp_db_path, mock_config_manager):
+        store1 = DatabaseMessageStore(temp_db_path, 'FIX.4.4', 'SENDER', 'TARGET', seqnum_flush_interval=60,
+                                      commit_batch_size=2)
+        store2 = DatabaseMessageStore(temp_db_path, 'FIX.4.4', 'TARGET', 'SENDER', seqnum_flush_interval=60,
+                                      commit_batch_size=2)
+        await store1.store_message('FIX.4.4', 'SENDER', 'TARGET', 1, 'a1')
+        await store2.store_message('FIX.4.4', 'TARGET', 'SENDER', 1, 'b1')
+
+        assert _query(temp_db_path, "SELECT COUNT(*) FROM messages") == [(2,)]
+        await store1.close()
+        await store2.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_store_keeps_batch_and_advances(self, temp_db_path, mock_config_manager):
+        store1 = DatabaseMessageStore(temp_db_path, 'FIX.4.4', 'SENDER', 'TARGET', seqnum_flush_interval=60)
+        store2 = DatabaseMessageStore(temp_db_path, 'FIX.4.4', 'TARGET', 'SENDER', seqnum_flush_interval=60)
+        await store1.initialize()
+        await store2.initialize()
+        await store1.store_and_advance(1, 'a1')
+        await store2.store_and_advance(1, 'b1')
+        await store2.store_and_advance(2, None)  # violates NOT NULL; the message was still sent
+        assert store2.get_next_outgoing_sequence_number() == 3
+        await store1.close()
+        await store2.close()
+
+        assert _query(temp_db_path, "SELECT sendercompid, msgseqnum FROM messages ORDER BY sendercompid") == [
+            ('SENDER', 1), ('TARGET', 1)]
+        assert _query(temp_db_path, "SELECT next_outgoing_seqnum FROM sessions WHERE sendercompid = 'TARGET'") == [(3,)]
+
+    @pytest.mark.asyncio
+    async def test_failed_bulk_store_keeps_other_pending_rows(self, temp_db_path, mock_config_manager):
+        store = DatabaseMessageStore(temp_db_path, 'FIX.4.4', 'SENDER', 'TARGET', seqnum_flush_interval=60)
+        await store.initialize()
+        await store.store_message('FIX.4.4', 'SENDER', 'TARGET', 1, 'pending')
+        rows = [('FIX.4.4', 'TARGET', 'SENDER', seq, f'msg{seq}') for seq in range(1, 301)]
+        rows[250] = ('FIX.4.4', 'TARGET', 'SENDER', 251, None)  # violates NOT NULL in the second chunk
+        await store.store_messages(rows)
+        await store.close()
+
+        assert _query(temp_db_path, "SELECT sendercompid, msgseqnum, message FROM messages") == [('SENDER', 1, 'pending')]
+
+    @pytest.mark.asyncio
+    async def test_stores_share_connection_per_file(self, temp_db_path, mock_config_manager):
+        store1 = DatabaseMessageStore(temp_db_path, 'FIX.4.4', 'SENDER', 'TARGET')
+        store2 = DatabaseMessageStore(temp_db_path, 'FIX.4.4', 'TARGET', 'SENDER')
+        assert store1.conn is store2.conn
+
+        await store1.close()
+        await store2.store_message('FIX.4.4', 'TARGET', 'SENDER', 1, 'still open')
+        assert await store2.get_message('FIX.4.4', 'TARGET', 'SENDER', 1) == 'still open'
+        await store2.close()
+
+        store3 = DatabaseMessageStore(temp_db_path, 'FIX.4.4', 'TARGET', 'SENDER')
+        assert store3.conn is not store1.conn  # the last release closed the shared connection
+        assert await store3.get_message('FIX.4.4', 'TARGET', 'SENDER', 1) == 'still open'
+        await store3.close()
+
+    @pytest.mark.asyncio
+    async def test_close_commits_shared_batch_for_remaining_stores(self, temp_db_path, mock_config_manager):
+        store1 = DatabaseMessageStore(temp_db_path, 'FIX.4.4', 'SENDER', 'TARGET', seqnum_flush_interval=60,
+                                      commit_batch_size=2)
+        store2 = DatabaseMessageStore(temp_db_path, 'FIX.4.4', 'TARGET', 'SENDER', seqnum_flush_interval=60,
+                                      commit_batch_size=2)
+        await store2.store_message('FIX.4.4', 'TARGET', 'SENDER', 1, 'b1')
+        await store1.close()
+        assert _query(temp_db_path, "SELECT msgseqnum FROM messages") == [(1,)]
+
+        # the close started a new batch, so one more row stays pending rather than committing early
+        await store2.store_message('FIX.4.4', 'TARGET', 'SENDER', 2, 'b2')
+        assert _query(temp_db_path, "SELECT msgseqnum FROM messages") == [(1,)]
+        await store2.close()
+        assert _query(temp_db_path, "SELECT msgseqnum FROM messages ORDER BY msgseqnum") == [(1,), (2,)]
+
+    @pytest.mark.asyncio
+    async def test_stores_on_other_loops_get_their_own_connection(self, temp_db_path, mock_config_manager):
+        store1 = DatabaseMessageStore(temp_db_path, 'FIX.4.4', 'SENDER', 'TARGET')
+
+        async def other_loop():
+            store2 = DatabaseMessageStore(temp_db_path, 'FIX.4.4', 'TARGET', 'SENDER')
+            await store2.store_message('FIX.4.4', 'TARGET', 'SENDER', 1, 'other loop')
+            conn = store2.conn
+            await store2.close()
+            return conn
+
+        assert await asyncio.to_thread(asyncio.run, other_loop()) is not store1.conn
+        assert await store1.get_message('FIX.4.4', 'TARGET', 'SENDER', 1) == 'other loop'
+        await store1.close()
+
+    @pytest.mark.asyncio
+    async def test_connection_uses_wal_journal(self, temp_db_path, mock_config_manager):
+        store = DatabaseMessageStore(temp_db_path, 'FIX.4.4', 'SENDER', 'TARGET')
+        assert _query(temp_db_path, "PRAGMA journal_mode") == [('wal',)]
+        await store.close()
 
 # Coverage targeting summary:
 """
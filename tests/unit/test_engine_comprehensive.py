@@ -79,6 +79,7 @@ class TestEngineAsyncLifecycle:
         mock_store.get_next_outgoing_sequence_number.return_value = 1
         mock_store.increment_outgoing_sequence_number = AsyncMock()
         mock_store.store_message = AsyncMock()
+        mock_store.store_and_advance = AsyncMock()
         mock_store.close = AsyncMock()
         engine.message_store = mock_store
         # Patch network.send to call connection.send_message
@@ -112,6 +113,7 @@ class TestEngineErrorHandling:
         mock_store.get_next_outgoing_sequence_number.return_value = 1
         mock_store.increment_outgoing_sequence_number = AsyncMock()
         mock_store.store_message = AsyncMock()
+        mock_store.store_and_advance = AsyncMock()
         mock_store.close = AsyncMock()
         engine.message_store = mock_store
         async def network_send(wire_message):
@@ -131,6 +133,7 @@ class TestEngineErrorHandling:
         mock_store.get_next_outgoing_sequence_number.return_value = 1
         mock_store.increment_outgoing_sequence_number = AsyncMock()
         mock_store.store_message = AsyncMock()
+        mock_store.store_and_advance = AsyncMock()
         mock_store.close = AsyncMock()
         engine.message_store = mock_store
         async def network_send(wire_message):
@@ -739,5 +739,145 @@ path = :memory:
             os.unlink(config_path)
 
 
+@pytest.mark.unit
+class TestFixChecksum:
+    """Inbound CheckSum(10) validation helper."""
+
+    def test_matches_trailer(self):
+        from pyfixmsg_plus.fixengine.engine import fix_checksum
+        body = b"8=FIX.4.4\x019=5\x0135=0\x01"
+        frame = body + b"10=%03d\x01" % (sum(body) % 256)
+        assert fix_checksum(frame, len(body)) == int(frame[-4:-1])
+
+    def test_detects_corruption(self):
+        from pyfixmsg_plus.fixengine.engine import fix_checksum
+        body = b"8=FIX.4.4\x019=5\x0135=0\x01"
+        frame = body.replace(b"35=0", b"35=1") + b"10=%03d\x01" % (sum(body) % 256)
+        assert fix_checksum(frame, len(body)) != int(frame[-4:-1])
+
+
+@pytest.mark.unit
+class TestExtractSequenceFields:
+    """Pre-parse extraction of MsgType/MsgSeqNum/PossDupFlag."""
+
+    def test_extracts_header_fields(self):
+        from pyfixmsg_plus.fixengine.engine import extract_sequence_fields
+        frame = b"8=FIX.4.4\x019=30\x0135=D\x0134=12\x0143=Y\x0149=SENDER\x0110=000\x01"
+        assert extract_sequence_fields(frame) == ('D', 12, True)
+
+    def test_missing_seqnum_and_possdup(self):
+        from pyfixmsg_plus.fixengine.engine import extract_sequence_fields
+        frame = b"8=FIX.4.4\x019=5\x0135=0\x0110=000\x01"
+        assert extract_sequence_fields(frame) == ('0', None, False)
+
+
+@pytest.mark.unit
+class TestSendingTime:
+    """SendingTime formatting and per-millisecond caching."""
+
+    def test_format_and_reuse(self):
+        import re
+        from pyfixmsg_plus.fixengine import engine as engine_module
+        with patch.object(engine_module.time, 'time_ns', return_value=1_700_000_000_123_456_789):
+            first = engine_module.sending_time()
+            assert engine_module.sending_time() is first
+        assert first == '20231114-22:13:20.123'
+        assert re.fullmatch(r"\d{8}-\d{2}:\d{2}:\d{2}\.\d{3}", engine_module.sending_time())
+
+
+@pytest.mark.unit
+class TestLoadSpec:
+    def test_spec_is_parsed_once_per_file(self):
+        from pyfixmsg_plus.fixengine import engine as engine_module
+        with patch.object(engine_module, 'FixSpec') as spec_cls:
+            first = engine_module.load_spec('FIX44.xml')
+            assert engine_module.load_spec('./FIX44.xml') is first
+            engine_module.load_spec('FIX42.xml')
+        assert spec_cls.call_count == 2
+
+
+@pytest.mark.unit
+class TestResetSessionState:
+    def test_clears_buffer_and_pending_gap_recovery(self):
+        import collections
+        from types import SimpleNamespace
+        engine = SimpleNamespace(
+            incoming_buffer=b"8=FIX.4.4\x019=", resend_request_outstanding=True,
+            resend_request_expected_seq=5, queued_while_resend=collections.deque([(7, b"...")]),
+        )
+        FixEngine._reset_session_state(engine)
+        assert engine.incoming_buffer == b""
+        assert engine.resend_request_outstanding is False
+        assert engine.resend_request_expected_seq is None
+        assert not engine.queued_while_resend
+
+
+@pytest.mark.unit
+class TestHandleSequenceGap:
+    @pytest.mark.asyncio
+    async def test_full_queue_keeps_lowest_seqnums(self):
+        import collections
+        import logging
+        from types import SimpleNamespace
+        engine = SimpleNamespace(
+            queued_while_resend=collections.deque([(seq, b"") for seq in range(6, 9)], maxlen=3),
+            logger=logging.getLogger("test"), session_id="S", send_resend_request=AsyncMock(),
+            resend_request_outstanding=True, resend_request_expected_seq=5,
+        )
+        await FixEngine.handle_sequence_gap(engine, 9, 5, b"")
+        assert [seq for seq, _ in engine.queued_while_resend] == [6, 7, 8]
+        engine.send_resend_request.assert_not_awaited()
+
+
+@pytest.mark.unit
+class TestOnNetworkDataFraming:
+    """Framing of inbound bytes into complete, checksum-valid messages."""
+
+    @staticmethod
+    def _frame(body):
+        head = b"8=FIX.4.4\x019=%d\x01" % len(body) + body
+        return head + b"10=%03d\x01" % (sum(head) % 256)
+
+    @pytest.mark.asyncio
+    async def test_frames_multiple_messages_and_keeps_partial_tail(self):
+        import collections
+        import logging
+        from types import SimpleNamespace
+        processed = []
+        engine = SimpleNamespace(
+            incoming_buffer=b"", logger=logging.getLogger("test"),
+            queued_while_resend=collections.deque(),
+            process_single_fix_message=AsyncMock(side_effect=processed.append),
+        )
+        first = self._frame(b"35=0\x0134=1\x01")
+        second = self._frame(b"35=0\x0134=2\x01")
+        corrupt = second[:-4] + b"999\x01"
+
+        await FixEngine.on_network_data(engine, b"junk" + first + corrupt + second[:10])
+        assert processed == [first]
+        assert engine.incoming_buffer == second[:10]
+
+        await FixEngine.on_network_data(engine, second[10:])
+        assert processed == [first, second]
+        assert engine.incoming_buffer == b""
+
+
+@pytest.mark.unit
+class TestToWire:
+    """BodyLength/CheckSum produced by FixMessage.to_wire."""
+
+    def test_length_and_checksum_match_wire_bytes(self):
+        from pyfixmsg.fixmessage import FixMessage
+        from pyfixmsg.codecs.stringfix import Codec
+        from pyfixmsg_plus.fixengine.engine import fix_checksum
+        codec = Codec()
+        msg = FixMessage({8: 'FIX.4.4', 35: 'D', 49: 'A', 56: 'B', 34: 5, 55: 'ÄAPL', 9: '999', 10: '000'})
+        msg.codec = codec
+        wire = msg.to_wire(codec)
+        body_start = wire.index(b'\x01', wire.index(b'\x019=') + 1) + 1
+        assert int(msg[9]) == len(wire) - body_start - 7
+        assert fix_checksum(wire, len(wire) - 7) == int(wire[-4:-1]) == int(msg[10])
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v', '--tb=short'])
@@ -40,4 +40,21 @@ class TestHeartbeatLifecycle:
         # Simulate missed heartbeat
         assert hasattr(hb, "last_heartbeat")
 
+    @pytest.mark.asyncio
+    async def test_paused_loop_wakes_on_active(self):
+        send_cb = AsyncMock()
+        state_machine = Mock()
+        state_machine.state.name = 'DISCONNECTED'
+        fix_engine = Mock()
+        fix_engine.fixmsg = Mock(return_value={})
+        hb = Heartbeat(interval=30, send_message_callback=send_cb, config_manager=Mock(), state_machine=state_machine, fix_engine=fix_engine)
+        await hb.start()
+        hb.last_sent_time -= 30  # heartbeat is due as soon as the session is active
+        await asyncio.sleep(0)
+        state_machine.state.name = 'ACTIVE'
+        hb._on_state_change('ACTIVE')
+        await asyncio.sleep(0.05)
+        await hb.stop()
+        send_cb.assert_awaited()
+
     # Add more tests for interval changes, missed heartbeat, recovery
@@ -299,6 +299,20 @@ class TestSpecificMessageHandlers:
         # Should call application.fromAdmin for heartbeat
         mock_dependencies['application'].fromAdmin.assert_called_once()
     
+    @pytest.mark.asyncio
+    async def test_resend_request_coalesces_gap_fills(self, mock_dependencies):
+        """Runs of missing messages are answered with one GapFill each."""
+        mock_dependencies['message_store'].get_messages_range = AsyncMock(return_value={3: b'stored'})
+        mock_dependencies['engine'].fixmsg = Mock(side_effect=lambda fields: MagicMock())
+        handler = ResendRequestHandler(**mock_dependencies)
+        handler.send_gap_fill = AsyncMock()
+
+        await handler.handle({7: '1', 16: '5', 34: '9', 35: '2'})
+
+        assert [c.args for c in handler.send_gap_fill.await_args_list] == [(1, 2), (4, 5)]
+        mock_dependencies['engine'].send_message.assert_awaited_once()
+        assert mock_dependencies['engine'].send_message.await_args.kwargs == {'override_seqnum': 3}
+
     @pytest.mark.asyncio
     async def test_test_request_handler(self, mock_dependencies):
         """Test TestRequestHandler functionality."""